@@ -1,94 +1,245 @@
 """JWT authentication middleware for extension clients."""
 
+import atexit
 import json
+import time
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Optional
 
 import httpx
 import jwt
-from fastapi import Header, HTTPException
-from jwt import PyJWKClient
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from jwt import PyJWK, PyJWKSet
+from jwt.exceptions import PyJWKClientError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AuthenticatedUser:
     id: str
     email: Optional[str]
 
 
-@lru_cache(maxsize=1)
-def _get_jwks_client() -> PyJWKClient:
-    """Get cached JWKS client for Supabase."""
-    settings = get_settings()
-    jwks_url = f"{settings.supabase_url}/auth/v1/.well-known/jwks.json"
-    return PyJWKClient(jwks_url, cache_keys=True)
+# Verified user cache: {token: (exp_timestamp, user)}
+_token_cache: dict[str, tuple[float, AuthenticatedUser]] = {}
+_TOKEN_CACHE_MAX = 4096
 
+_BEARER = b"Bearer "
+_BEARER_LEN = len(_BEARER)
 
-def _decode_jwt(token: str) -> dict:
-    """Decode and verify a Supabase JWT using JWKS (supports ES256)."""
-    settings = get_settings()
+# Signing key cache: {kid: (fetched_at, key)}; single dict gets/sets, so no lock
+_signing_keys: dict[str, tuple[float, PyJWK]] = {}
 
+# Captured from settings at startup (see configure_auth) so the verify path
+# doesn't go back through get_settings()
+_jwks_url: Optional[str] = None
+_jwks_cache_ttl: Optional[float] = None
+
+
+# Shared keep-alive client for JWKS fetches
+_jwks_http = httpx.Client(timeout=5.0, limits=httpx.Limits(max_keepalive_connections=4))
+atexit.register(_jwks_http.close)
+
+# Minimum gap between JWKS fetches triggered by an unknown kid, so tokens with
+# made-up kids can't turn every request into an outbound fetch
+_JWKS_MISS_COOLDOWN = 30.0  # seconds
+_jwks_fetched_at: Optional[float] = None
+
+
+def configure_auth(settings: Settings) -> None:
+    """Capture the JWKS URL and key TTL from settings once."""
+    global _jwks_url, _jwks_cache_ttl
+    _jwks_url = f"{settings.supabase_url}/auth/v1/.well-known/jwks.json"
+    _jwks_cache_ttl = float(settings.jwks_cache_ttl)
+
+
+def _fetch_signing_keys() -> dict[str, PyJWK]:
+    """Fetch the JWKS over the pooled client and cache every signing key in it.
+
+    Only PyJWT's public PyJWKSet parser is used, so the fetch doesn't depend
+    on PyJWKClient internals. Returns the fetched keys by kid.
+    """
+    global _jwks_fetched_at
+    if _jwks_url is None:
+        configure_auth(get_settings())
+    resp = _jwks_http.get(_jwks_url)
+    resp.raise_for_status()
+    jwk_set = PyJWKSet.from_dict(resp.json())
+
+    now = time.monotonic()
+    keys = {
+        key.key_id: key
+        for key in jwk_set.keys
+        if key.key_id and key.public_key_use in ("sig", None)
+    }
+    _jwks_fetched_at = now
+    _signing_keys.update({kid: (now, key) for kid, key in keys.items()})
+    return keys
+
+
+def _get_signing_key(kid: str) -> PyJWK:
+    """Get the JWKS signing key for a kid, refetching once the entry is stale.
+
+    Each kid is kept for a bounded TTL, so rotated or revoked keys drop out
+    after the next fetch. Concurrent misses for the same kid may both fetch,
+    which is harmless.
+    """
+    if _jwks_cache_ttl is None:
+        configure_auth(get_settings())
+    cached = _signing_keys.get(kid)
+    if cached and time.monotonic() - cached[0] < _jwks_cache_ttl:
+        return cached[1]
+
+    if cached is None and _jwks_fetched_at is not None and (
+        time.monotonic() - _jwks_fetched_at < _JWKS_MISS_COOLDOWN
+    ):
+        raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+
+    signing_key = _fetch_signing_keys().get(kid)
+    if signing_key is None:
+        raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+    return signing_key
+
+
+def warm_signing_keys() -> int:
+    """Fetch the JWKS and pre-populate the signing key cache. Returns key count."""
+    return len(_fetch_signing_keys())
+
+
+def _try_decode(token: str) -> tuple[Optional[dict], Optional[HTTPException]]:
+    """Decode and verify a Supabase JWT using JWKS (supports ES256).
+
+    Returns (payload, None) on success or (None, error) on failure, so
+    optional auth doesn't pay for raising and unwinding on every bad token.
+    """
     try:
-        # Get the signing key from Supabase JWKS endpoint
-        jwks_client = _get_jwks_client()
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        # Parse the header once and route on kid/alg before touching JWKS
+        header = jwt.get_unverified_header(token)
+        kid = header.get("kid")
+        if not kid:
+            return None, HTTPException(status_code=401, detail="Invalid token: Token header missing kid")
+        signing_key = _get_signing_key(kid)
+
+        # The JWK pins its algorithm; reject mismatches without a verify attempt
+        if header.get("alg") != signing_key.algorithm_name:
+            return None, HTTPException(
+                status_code=401, detail="Invalid token: The specified alg value is not allowed"
+            )
 
         return jwt.decode(
             token,
             signing_key.key,
-            algorithms=["ES256", "HS256"],
+            algorithms=[signing_key.algorithm_name],
             audience="authenticated",
-        )
+        ), None
     except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
+        return None, HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError as e:
-        raise HTTPException(status_code=401, detail=f"Invalid token: {e}")
+        return None, HTTPException(status_code=401, detail=f"Invalid token: {e}")
     except Exception as e:
         # JWKS fetch failed - log and return helpful error
-        raise HTTPException(status_code=500, detail=f"JWT verification failed: {e}")
+        return None, HTTPException(status_code=500, detail=f"JWT verification failed: {e}")
 
 
-def get_current_user(
-    authorization: str = Header(...),
-) -> AuthenticatedUser:
-    """Extract and verify the authenticated user from the Authorization header."""
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Invalid authorization header")
+def _is_cached(token: str) -> bool:
+    """Whether a token's verified user is in the cache and unexpired."""
+    cached = _token_cache.get(token)
+    return bool(cached and cached[0] > time.time())
 
-    token = authorization[len("Bearer "):]
-    payload = _decode_jwt(token)
-
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Token missing sub claim")
-
-    return AuthenticatedUser(
-        id=user_id,
-        email=payload.get("email"),
-    )
 
+def _authenticate(token: str) -> tuple[Optional[AuthenticatedUser], Optional[HTTPException]]:
+    """Resolve a Bearer token to a user, or the error explaining why not.
 
-def get_optional_user(
-    authorization: Optional[str] = Header(None),
-) -> Optional[AuthenticatedUser]:
-    """Extract user from Authorization header if present, otherwise return None."""
-    if not authorization or not authorization.startswith("Bearer "):
-        return None
+    Verified users are cached until the token's exp claim passes.
+    """
+    cached = _token_cache.get(token)
+    if cached and cached[0] > time.time():
+        return cached[1], None
 
-    token = authorization[len("Bearer "):]
-    try:
-        payload = _decode_jwt(token)
-    except HTTPException:
-        return None
+    payload, error = _try_decode(token)
+    if error:
+        return None, error
 
     user_id = payload.get("sub")
     if not user_id:
-        return None
+        return None, HTTPException(status_code=401, detail="Token missing sub claim")
+    user = AuthenticatedUser(id=user_id, email=payload.get("email"))
+
+    exp = payload.get("exp")
+    if exp:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            # Drop expired entries first, then the oldest if still full
+            now = time.time()
+            for key in [k for k, (e, _) in _token_cache.items() if e <= now]:
+                del _token_cache[key]
+            if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (float(exp), user)
+
+    return user, None
+
+
+class JWTAuthMiddleware:
+    """Pure ASGI middleware that verifies the Bearer token once per request.
+
+    The result is stored in scope["state"] so the auth dependencies below are
+    plain lookups instead of re-parsing headers and re-running verification.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # ASGI headers are raw bytes with lowercased names
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+                break
+
+        user, error = None, None
+        if authorization is None:
+            error = HTTPException(status_code=401, detail="Missing authorization header")
+        elif not authorization.startswith(_BEARER):
+            error = HTTPException(status_code=401, detail="Invalid authorization header")
+        else:
+            try:
+                # JWTs are base64url, so anything non-ASCII is malformed
+                token = authorization[_BEARER_LEN:].decode("ascii")
+            except UnicodeDecodeError:
+                error = HTTPException(status_code=401, detail="Invalid authorization header")
+            else:
+                if _is_cached(token):
+                    user, error = _authenticate(token)
+                else:
+                    # Cache miss may hit the JWKS endpoint - keep it off the event loop
+                    user, error = await run_in_threadpool(_authenticate, token)
+
+        state = scope.setdefault("state", {})
+        state["user"] = user
+        state["auth_error"] = error
+
+        await self.app(scope, receive, send)
+
+
+async def get_current_user(request: Request) -> AuthenticatedUser:
+    """Return the user verified by JWTAuthMiddleware, or raise 401."""
+    state = request.scope.get("state", {})
+    user = state.get("user")
+    if user is None:
+        raise state.get("auth_error") or HTTPException(
+            status_code=401, detail="Missing authorization header"
+        )
+    return user
+
 
-    return AuthenticatedUser(
-        id=user_id,
-        email=payload.get("email"),
-    )
+async def get_optional_user(request: Request) -> Optional[AuthenticatedUser]:
+    """Return the user verified by JWTAuthMiddleware if present, otherwise None."""
+    return request.scope.get("state", {}).get("user")
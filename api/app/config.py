@@ -1,6 +1,5 @@
 """Application configuration using Pydantic settings."""
 
-from functools import lru_cache
 from typing import Optional
 
 from pydantic_settings import BaseSettings
@@ -13,6 +12,8 @@ class Settings(BaseSettings):
     app_name: str = "LeetLoop API"
     debug: bool = False
     environment: str = "development"
+    # Threads for blocking I/O (supabase-py, Gemini SDK) run off the event loop
+    worker_threads: int = 200
 
     # Supabase
     supabase_url: str
@@ -43,6 +44,7 @@ class Settings(BaseSettings):
 
     # JWT verification (Supabase JWT secret for extension auth)
     supabase_jwt_secret: Optional[str] = None
+    jwks_cache_ttl: int = 3600  # seconds before a cached signing key is refetched
 
     # Cron job authentication
     cron_secret: Optional[str] = None
@@ -62,7 +64,12 @@ class Settings(BaseSettings):
         extra = "ignore"  # Ignore extra env vars like PORT
 
 
-@lru_cache
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -1,27 +1,81 @@
 """Supabase client for database operations."""
 
-from functools import lru_cache
+from typing import Optional
 
+import httpx
 from supabase import Client, create_client
 
 from app.config import get_settings
 
 
-@lru_cache
+_client: Optional[Client] = None
+_admin_client: Optional[Client] = None
+_postgrest_http: Optional[httpx.AsyncClient] = None
+
+
 def get_supabase_client() -> Client:
     """Get cached Supabase client instance."""
-    settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = create_client(settings.supabase_url, settings.supabase_anon_key)
+    return _client
 
 
 def get_supabase_admin_client() -> Client:
-    """Get Supabase client with service role key for admin operations."""
-    settings = get_settings()
-    if not settings.supabase_service_role_key:
-        raise ValueError("SUPABASE_SERVICE_ROLE_KEY not configured")
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    """Get cached Supabase client with service role key for admin operations."""
+    global _admin_client
+    if _admin_client is None:
+        settings = get_settings()
+        if not settings.supabase_service_role_key:
+            raise ValueError("SUPABASE_SERVICE_ROLE_KEY not configured")
+        _admin_client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return _admin_client
 
 
 async def get_supabase() -> Client:
     """Dependency for getting Supabase client in routes."""
     return get_supabase_client()
+
+
+def get_postgrest_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client for direct PostgREST calls.
+
+    One pooled client for the whole process, so reads that go straight to
+    PostgREST reuse keep-alive connections instead of blocking the event
+    loop on the sync supabase-py client.
+    """
+    global _postgrest_http
+    if _postgrest_http is None:
+        settings = get_settings()
+        _postgrest_http = httpx.AsyncClient(
+            base_url=f"{settings.supabase_url}/rest/v1",
+            headers={
+                "apikey": settings.supabase_anon_key,
+                "Authorization": f"Bearer {settings.supabase_anon_key}",
+            },
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _postgrest_http
+
+
+async def close_postgrest_client() -> None:
+    """Close the shared PostgREST client on shutdown."""
+    global _postgrest_http
+    if _postgrest_http is not None:
+        await _postgrest_http.aclose()
+        _postgrest_http = None
+
+
+async def get_postgrest() -> httpx.AsyncClient:
+    """Dependency for getting the async PostgREST client in routes."""
+    return get_postgrest_client()
+
+
+def parse_content_range_total(content_range: Optional[str]) -> int:
+    """Extract the total row count from a PostgREST Content-Range header (e.g. "0-19/42")."""
+    if not content_range or "/" not in content_range:
+        return 0
+    total = content_range.rsplit("/", 1)[1]
+    return int(total) if total.isdigit() else 0
@@ -1,21 +1,106 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp
 
+from app.auth import JWTAuthMiddleware, configure_auth, warm_signing_keys
 from app.config import get_settings
+from app.db.supabase import close_postgrest_client, get_postgrest_client, get_supabase_client
+from app.services.gemini_gateway import get_gemini_gateway
 from app.routers import auth, coaching, feed, health, journal, language, language_oral, mastery, mission, ml_coding, onboarding, onsite_prep, paths, progress, recommendations, reviews, submissions, system_design, today, winrate
 
 
+# All /api routers, aggregated once at import and mounted in a single include_router
+_API_ROUTERS = (
+    ("auth", auth.router),
+    ("recommendations", recommendations.router),
+    ("progress", progress.router),
+    ("reviews", reviews.router),
+    ("coaching", coaching.router),
+    ("paths", paths.router),
+    ("today", today.router),
+    ("mastery", mastery.router),
+    ("mission", mission.router),
+    ("submissions", submissions.router),
+    ("winrate", winrate.router),
+    ("feed", feed.router),
+    ("onboarding", onboarding.router),
+    ("system-design", system_design.router),
+    ("language", language.router),
+    ("language-oral", language_oral.router),
+    ("ml-coding", ml_coding.router),
+    ("onsite-prep", onsite_prep.router),
+    ("journal", journal.router),
+)
+
+api_router = APIRouter(prefix="/api")
+for _tag, _router in _API_ROUTERS:
+    api_router.include_router(_router, tags=[_tag])
+
+
+class OriginSetCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that checks the Origin header against a frozenset.
+
+    Starlette keeps allow_origins as the list it was given and scans it on
+    every request; hashing the allowlist once makes the check O(1).
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.allow_origins = frozenset(self.allow_origins)
+
+
+def _start_log_listener() -> tuple[QueueListener, QueueHandler]:
+    """Route app log records through a queue so handlers never write on the event loop."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(queue_handler)
+    app_logger.setLevel(logging.INFO)
+    listener.start()
+    return listener, queue_handler
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown."""
     # Startup
+    log_listener, log_handler = _start_log_listener()
     settings = get_settings()
     print(f"Starting {settings.app_name} in {settings.environment} mode")
 
+    # Blocking supabase-py calls go through asyncio.to_thread and Starlette's
+    # threadpool; size both so a burst of requests doesn't queue behind the
+    # defaults (40 anyio tokens, min(32, cpus + 4) executor threads)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.worker_threads
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.worker_threads, thread_name_prefix="blocking-io")
+    )
+
+    # Warm the Supabase, PostgREST and Gemini clients and the JWKS cache so the first request doesn't pay for them
+    configure_auth(settings)
+    get_supabase_client()
+    get_postgrest_client()
+    get_gemini_gateway()
+    try:
+        key_count = await asyncio.to_thread(warm_signing_keys)
+        print(f"JWKS cache warmed with {key_count} signing key(s)")
+    except Exception as e:
+        print(f"JWKS warmup failed (non-fatal): {e}")
+
     # Initialize Telegram bot if configured
     bot_app = None
     if settings.telegram_bot_token:
@@ -36,6 +121,10 @@ async def lifespan(app: FastAPI):
             await bot_app.shutdown()
         except Exception:
             pass
+    await close_postgrest_client()
+    await auth.close_http_client()
+    logging.getLogger("app").removeHandler(log_handler)
+    log_listener.stop()
     print("Shutting down...")
 
 
@@ -48,13 +137,17 @@ def create_app() -> FastAPI:
         description="Backend API for LeetLoop - A systematic LeetCode learning coach",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
     )
 
+    # Bearer token verification (runs inside CORS)
+    app.add_middleware(JWTAuthMiddleware)
+
     # CORS middleware
     app.add_middleware(
-        CORSMiddleware,
+        OriginSetCORSMiddleware,
         allow_origins=settings.allowed_origins,
         allow_credentials=True,
         allow_methods=["*"],
@@ -63,25 +156,7 @@ def create_app() -> FastAPI:
 
     # Include routers
     app.include_router(health.router)
-    app.include_router(auth.router, prefix="/api", tags=["auth"])
-    app.include_router(recommendations.router, prefix="/api", tags=["recommendations"])
-    app.include_router(progress.router, prefix="/api", tags=["progress"])
-    app.include_router(reviews.router, prefix="/api", tags=["reviews"])
-    app.include_router(coaching.router, prefix="/api", tags=["coaching"])
-    app.include_router(paths.router, prefix="/api", tags=["paths"])
-    app.include_router(today.router, prefix="/api", tags=["today"])
-    app.include_router(mastery.router, prefix="/api", tags=["mastery"])
-    app.include_router(mission.router, prefix="/api", tags=["mission"])
-    app.include_router(submissions.router, prefix="/api", tags=["submissions"])
-    app.include_router(winrate.router, prefix="/api", tags=["winrate"])
-    app.include_router(feed.router, prefix="/api", tags=["feed"])
-    app.include_router(onboarding.router, prefix="/api", tags=["onboarding"])
-    app.include_router(system_design.router, prefix="/api", tags=["system-design"])
-    app.include_router(language.router, prefix="/api", tags=["language"])
-    app.include_router(language_oral.router, prefix="/api", tags=["language-oral"])
-    app.include_router(ml_coding.router, prefix="/api", tags=["ml-coding"])
-    app.include_router(onsite_prep.router, prefix="/api", tags=["onsite-prep"])
-    app.include_router(journal.router, prefix="/api", tags=["journal"])
+    app.include_router(api_router)
 
     return app
 
@@ -1,10 +1,10 @@
 """Pydantic schemas for book content ingestion."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 # ============ Section/Chapter Structure ============
@@ -17,7 +17,7 @@ class SectionInfo(BaseModel):
     summary: Optional[str] = None
     page_start: int
     page_end: int
-    key_points: list[str] = []
+    key_points: tuple[str, ...] = ()
 
 
 class CaseStudy(BaseModel):
@@ -25,7 +25,7 @@ class CaseStudy(BaseModel):
 
     name: str
     description: str
-    systems: list[str] = []  # Real-world systems mentioned
+    systems: tuple[str, ...] = ()  # Real-world systems mentioned
     page: Optional[int] = None
 
 
@@ -35,9 +35,9 @@ class ChapterContent(BaseModel):
     chapter_number: int
     title: str
     summary: Optional[str] = None
-    sections: list[SectionInfo] = []
-    key_concepts: list[str] = []
-    case_studies: list[CaseStudy] = []
+    sections: tuple[SectionInfo, ...] = ()
+    key_concepts: tuple[str, ...] = ()
+    case_studies: tuple[CaseStudy, ...] = ()
     page_start: int
     page_end: int
 
@@ -57,13 +57,15 @@ class BookStructure(BaseModel):
 class BookContentRecord(BaseModel):
     """A book content record as stored in the database."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     book_title: str
     chapter_number: int
     chapter_title: str
-    sections: list[SectionInfo] = []
-    key_concepts: list[str] = []
-    case_studies: list[CaseStudy] = []
+    sections: tuple[SectionInfo, ...] = ()
+    key_concepts: tuple[str, ...] = ()
+    case_studies: tuple[CaseStudy, ...] = ()
     summary: Optional[str] = None
     page_start: int
     page_end: int
@@ -73,6 +75,8 @@ class BookContentRecord(BaseModel):
 
 # ============ Ingestion Models ============
 
+MAX_KEY_CONCEPTS = 15
+
 
 class PageChunk(BaseModel):
     """A chunk of pages for processing."""
@@ -96,10 +100,18 @@ class ContentExtractionResult(BaseModel):
     chapter_number: int
     title: str
     summary: str
-    key_concepts: list[str] = Field(default=[], max_length=15)
+    key_concepts: Annotated[list[str], Field(max_length=MAX_KEY_CONCEPTS)] = []
     sections: list[SectionInfo] = []
     case_studies: list[CaseStudy] = []
 
+    @field_validator("key_concepts", mode="before")
+    @classmethod
+    def _trim_key_concepts(cls, v):
+        # Truncate over-long Gemini output rather than failing the whole chapter
+        if isinstance(v, list) and len(v) > MAX_KEY_CONCEPTS:
+            return v[:MAX_KEY_CONCEPTS]
+        return v
+
 
 # ============ Gemini Prompts Context ============
 
@@ -1,7 +1,7 @@
 """Pydantic schemas for Language Oral Practice."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -39,7 +39,7 @@ class OralDimensionScore(BaseModel):
     """Score for a single rubric dimension with cited evidence."""
 
     name: str  # "grammar", "lexical", "discourse", "task"
-    score: float = Field(ge=1, le=10)
+    score: Annotated[float, Field(ge=1.0, le=10.0)]
     evidence: list[OralDimensionEvidence] = []
     summary: str = ""
 
@@ -1,10 +1,17 @@
 """Pydantic schemas for Language Learning feature."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+# Review and active-track requests are shared with the system design feature
+from app.models.system_design_schemas import (  # noqa: F401
+    CompleteReviewRequest,
+    CompleteReviewResponse,
+    SetActiveTrackRequest,
+)
 
 
 # ============ Track Models ============
@@ -22,10 +29,10 @@ class LanguageTopicInfo(BaseModel):
 class LanguageRubricWeights(BaseModel):
     """Rubric dimension weights for language grading."""
 
-    accuracy: int = Field(default=3, ge=1, le=5)
-    grammar: int = Field(default=3, ge=1, le=5)
-    vocabulary: int = Field(default=2, ge=1, le=5)
-    naturalness: int = Field(default=2, ge=1, le=5)
+    accuracy: Annotated[int, Field(ge=1, le=5)] = 3
+    grammar: Annotated[int, Field(ge=1, le=5)] = 3
+    vocabulary: Annotated[int, Field(ge=1, le=5)] = 2
+    naturalness: Annotated[int, Field(ge=1, le=5)] = 2
 
 
 class LanguageTrack(BaseModel):
@@ -74,7 +81,7 @@ class SubmitLanguageAttemptRequest(BaseModel):
 class LanguageAttemptGrade(BaseModel):
     """Grading result for a language attempt."""
 
-    score: float = Field(ge=1, le=10)
+    score: Annotated[float, Field(ge=1.0, le=10.0)]
     verdict: str  # "pass", "fail", "borderline"
     feedback: str
     corrections: Optional[str] = None
@@ -84,6 +91,8 @@ class LanguageAttemptGrade(BaseModel):
 class LanguageAttempt(BaseModel):
     """A language exercise attempt."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     user_id: UUID
     track_id: Optional[UUID] = None
@@ -92,14 +101,14 @@ class LanguageAttempt(BaseModel):
     question_text: str
     expected_answer: Optional[str] = None
     question_focus_area: Optional[str] = None
-    question_key_concepts: list[str] = []
+    question_key_concepts: tuple[str, ...] = ()
     response_text: Optional[str] = None
     word_count: int = 0
     score: Optional[float] = None
     verdict: Optional[str] = None
     feedback: Optional[str] = None
     corrections: Optional[str] = None
-    missed_concepts: list[str] = []
+    missed_concepts: tuple[str, ...] = ()
     status: str = "pending"
     created_at: datetime
     graded_at: Optional[datetime] = None
@@ -108,6 +117,8 @@ class LanguageAttempt(BaseModel):
 class LanguageAttemptHistoryItem(BaseModel):
     """Summary of a past attempt for history view."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     topic: str
     exercise_type: str
@@ -123,17 +134,25 @@ class LanguageAttemptHistoryItem(BaseModel):
 class LanguageAttemptHistoryResponse(BaseModel):
     """List of past attempts with pagination."""
 
+    model_config = ConfigDict(frozen=True)
+
     attempts: list[LanguageAttemptHistoryItem]
     total: int
     has_more: bool
 
 
+# Validate whole result sets in one pydantic-core call instead of per-row models
+LANGUAGE_ATTEMPT_HISTORY_ADAPTER = TypeAdapter(list[LanguageAttemptHistoryItem])
+
+
 # ============ Review Queue Models ============
 
 
 class LanguageReviewItem(BaseModel):
     """A topic in the spaced repetition review queue."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     user_id: UUID
     track_id: Optional[UUID] = None
@@ -148,18 +167,7 @@ class LanguageReviewItem(BaseModel):
     created_at: datetime
 
 
-class CompleteReviewRequest(BaseModel):
-    """Request to mark a review as complete."""
-
-    success: bool
-
-
-class CompleteReviewResponse(BaseModel):
-    """Response after completing a review."""
-
-    id: UUID
-    next_review: datetime
-    new_interval_days: int
+LANGUAGE_REVIEW_ITEMS_ADAPTER = TypeAdapter(list[LanguageReviewItem])
 
 
 # ============ Progress Models ============
@@ -232,12 +240,6 @@ class LanguageDashboardSummary(BaseModel):
     book_completion_percentage: float = 0.0
 
 
-class SetActiveTrackRequest(BaseModel):
-    """Request to set active language track."""
-
-    track_id: Optional[UUID] = None
-
-
 # ============ Gemini Context Models ============
 
 
@@ -255,7 +257,7 @@ class LanguageQuestionContext(BaseModel):
 class LanguageGradingResponse(BaseModel):
     """Gemini's grading response for a language exercise."""
 
-    score: float = Field(ge=1, le=10)
+    score: Annotated[float, Field(ge=1.0, le=10.0)]
     verdict: str  # "pass", "fail", "borderline"
     feedback: str
     corrections: Optional[str] = None
@@ -1,7 +1,7 @@
 """Pydantic schemas for Life Ops feature."""
 
 from datetime import date, datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -46,7 +46,7 @@ class CreateTaskRequest(BaseModel):
     category_id: UUID
     title: str
     description: Optional[str] = None
-    recurrence_days: int = Field(default=127, ge=0, le=127)  # bitmask Mon-Sun
+    recurrence_days: Annotated[int, Field(ge=0, le=127)] = 127  # bitmask Mon-Sun
     sort_order: int = 0
 
 
@@ -56,7 +56,7 @@ class UpdateTaskRequest(BaseModel):
     category_id: Optional[UUID] = None
     title: Optional[str] = None
     description: Optional[str] = None
-    recurrence_days: Optional[int] = Field(default=None, ge=0, le=127)
+    recurrence_days: Annotated[Optional[int], Field(ge=0, le=127)] = None
     sort_order: Optional[int] = None
     is_active: Optional[bool] = None
 
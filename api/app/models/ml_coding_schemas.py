@@ -1,7 +1,7 @@
 """Pydantic schemas for ML Coding Drills feature."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -72,12 +72,12 @@ class SubmitMLCodingExerciseRequest(BaseModel):
 class MLCodingExerciseGrade(BaseModel):
     """Grading result for an ML coding exercise."""
 
-    score: float = Field(ge=0, le=10)
+    score: Annotated[float, Field(ge=0.0, le=10.0)]
     verdict: str  # "pass", "borderline", "fail"
     feedback: str
-    correctness_score: float = Field(ge=0, le=10)
-    code_quality_score: float = Field(ge=0, le=10)
-    math_understanding_score: float = Field(ge=0, le=10)
+    correctness_score: Annotated[float, Field(ge=0.0, le=10.0)]
+    code_quality_score: Annotated[float, Field(ge=0.0, le=10.0)]
+    math_understanding_score: Annotated[float, Field(ge=0.0, le=10.0)]
     missed_concepts: list[str] = []
     suggested_improvements: list[str] = []
 
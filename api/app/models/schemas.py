@@ -2,10 +2,10 @@
 
 from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class SubmissionStatus(str, Enum):
@@ -18,6 +18,11 @@ class SubmissionStatus(str, Enum):
     RUNTIME_ERROR = "Runtime Error"
     COMPILE_ERROR = "Compile Error"
 
+    @staticmethod
+    def is_success(status: Optional[str]) -> bool:
+        """Whether a raw status string (e.g. from a DB row) is a success."""
+        return status in _SUCCESS_STATUSES
+
 
 class Difficulty(str, Enum):
     """Problem difficulty levels."""
@@ -27,11 +32,28 @@ class Difficulty(str, Enum):
     HARD = "Hard"
 
 
+# Plain-string success set for O(1) checks against pre-validated DB rows
+_SUCCESS_STATUSES = frozenset({SubmissionStatus.ACCEPTED.value})
+
+
+class FastBaseModel(BaseModel):
+    """Base for API schemas; defers core-schema build until first use.
+
+    Most of these models are touched by a handful of endpoints, so building
+    them lazily keeps import and cold-start time down. Hot models opt back
+    into eager builds.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
 # ============ Submission Models ============
 
 
-class Submission(BaseModel):
-    """A single submission record."""
+class SubmissionSummary(FastBaseModel):
+    """A submission record without its source code, for list responses."""
+
+    model_config = ConfigDict(defer_build=False)
 
     id: UUID
     user_id: UUID
@@ -48,57 +70,102 @@ class Submission(BaseModel):
     attempt_number: Optional[int] = None
     time_elapsed_seconds: Optional[int] = None
     language: Optional[str] = None
+    session_id: Optional[UUID] = None
+    # Response-only: timestamps pass through as PostgREST's ISO strings
+    submitted_at: str
+    created_at: str
+
+    @classmethod
+    def from_row(cls, row: dict):
+        """Build from a trusted ``submissions`` row, skipping validation.
+
+        Column types are enforced by the database, so only the values
+        PostgREST returns as strings (UUIDs, enums) are converted; timestamps
+        pass through verbatim. A row the fast path can't convert (an unknown
+        enum value, a missing column) goes through full validation instead, so
+        it fails as a ValidationError rather than a bare ValueError/KeyError.
+        """
+        try:
+            values = {name: row[name] for name in cls.model_fields if name in row}
+            values["id"] = UUID(row["id"])
+            values["user_id"] = UUID(row["user_id"])
+            values["status"] = SubmissionStatus(row["status"])
+            if row.get("session_id"):
+                values["session_id"] = UUID(row["session_id"])
+            if row.get("difficulty"):
+                values["difficulty"] = Difficulty(row["difficulty"])
+        except (KeyError, TypeError, ValueError):
+            return cls.model_validate(row)
+        return cls.model_construct(**values)
+
+
+# ``submissions`` columns a SubmissionSummary reads, so list queries skip the code blob
+SUBMISSION_SUMMARY_COLUMNS = ", ".join(SubmissionSummary.model_fields)
+
+
+class Submission(SubmissionSummary):
+    """A single submission record."""
+
     code: Optional[str] = None
     code_length: Optional[int] = None
-    session_id: Optional[UUID] = None
-    submitted_at: datetime
-    created_at: datetime
 
 
 # ============ Skill Score Models ============
 
 
-class SkillScore(BaseModel):
+class SkillScore(FastBaseModel):
     """User's skill level for a specific tag/topic."""
 
+    model_config = ConfigDict(defer_build=False)
+
     user_id: UUID
     tag: str
-    score: float = Field(ge=0, le=100, default=50.0)
+    score: Annotated[float, Field(ge=0.0, le=100.0)] = 50.0
     total_attempts: int = 0
-    success_rate: float = Field(ge=0, le=1, default=0.0)
+    success_rate: Annotated[float, Field(ge=0.0, le=1.0)] = 0.0
     avg_time_seconds: Optional[float] = None
-    last_practiced: Optional[datetime] = None
-    updated_at: Optional[datetime] = None
+    last_practiced: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+SKILL_SCORE_LIST_ADAPTER = TypeAdapter(list[SkillScore])
 
 
 # ============ Review Queue Models ============
 
 
-class ReviewItem(BaseModel):
+class ReviewItem(FastBaseModel):
     """An item in the spaced repetition review queue."""
 
+    model_config = ConfigDict(defer_build=False)
+
     id: UUID
     user_id: UUID
     problem_slug: str
     problem_title: Optional[str] = None
     reason: Optional[str] = None
     priority: int = 0
-    next_review: datetime
+    next_review: str
     interval_days: int = 1
     review_count: int = 0
-    last_reviewed: Optional[datetime] = None
-    created_at: datetime
+    last_reviewed: Optional[str] = None
+    created_at: str
+
 
+REVIEW_ITEM_LIST_ADAPTER = TypeAdapter(list[ReviewItem])
 
-class ReviewCompleteRequest(BaseModel):
+
+class ReviewCompleteRequest(FastBaseModel):
     """Request to mark a review as complete."""
 
     success: bool
 
 
-class ReviewCompleteResponse(BaseModel):
+class ReviewCompleteResponse(FastBaseModel):
     """Response after completing a review."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: UUID
     next_review: Optional[datetime] = None
     new_interval_days: Optional[int] = None
@@ -108,7 +175,7 @@ class ReviewCompleteResponse(BaseModel):
 # ============ Progress/Stats Models ============
 
 
-class UserStats(BaseModel):
+class UserStats(FastBaseModel):
     """Aggregated statistics for a user."""
 
     total_submissions: int = 0
@@ -122,7 +189,7 @@ class UserStats(BaseModel):
     best_day_count: int = 0
 
 
-class ProgressTrend(BaseModel):
+class ProgressTrend(FastBaseModel):
     """Progress data point for trend charts."""
 
     date: str
@@ -131,19 +198,19 @@ class ProgressTrend(BaseModel):
     success_rate: float
 
 
-class UserProgress(BaseModel):
+class UserProgress(FastBaseModel):
     """Complete progress data for a user."""
 
     stats: UserStats
     skill_scores: list[SkillScore] = []
     trends: list[ProgressTrend] = []
-    recent_submissions: list[Submission] = []
+    recent_submissions: list[SubmissionSummary] = []
 
 
 # ============ Recommendation Models ============
 
 
-class RecommendedProblem(BaseModel):
+class RecommendedProblem(FastBaseModel):
     """A problem recommended for the user to attempt."""
 
     problem_slug: str
@@ -155,7 +222,7 @@ class RecommendedProblem(BaseModel):
     source: str  # "review_queue", "weak_skill", "progression"
 
 
-class RecommendationResponse(BaseModel):
+class RecommendationResponse(FastBaseModel):
     """Response containing personalized recommendations."""
 
     user_id: UUID
@@ -167,7 +234,7 @@ class RecommendationResponse(BaseModel):
 # ============ Coaching Models ============
 
 
-class ChatMessage(BaseModel):
+class ChatMessage(FastBaseModel):
     """A single chat message."""
 
     role: str  # "user" or "assistant"
@@ -175,7 +242,7 @@ class ChatMessage(BaseModel):
     timestamp: Optional[datetime] = None
 
 
-class ChatRequest(BaseModel):
+class ChatRequest(FastBaseModel):
     """Request for coaching chat."""
 
     user_id: UUID
@@ -184,14 +251,23 @@ class ChatRequest(BaseModel):
     history: list[ChatMessage] = []
 
 
-class ChatResponse(BaseModel):
+class ChatResponse(FastBaseModel):
     """Response from coaching chat."""
 
     message: str
     suggestions: list[str] = []  # Follow-up suggestions
 
 
-class CodeAnalysisRequest(BaseModel):
+MAX_TIPS_BATCH_USERS = 20
+
+
+class TipsBatchRequest(FastBaseModel):
+    """Request for personalized tips for several users at once."""
+
+    user_ids: Annotated[list[UUID], Field(min_length=1, max_length=MAX_TIPS_BATCH_USERS)]
+
+
+class CodeAnalysisRequest(FastBaseModel):
     """Request to analyze submitted code."""
 
     user_id: UUID
@@ -207,7 +283,7 @@ class CodeAnalysisRequest(BaseModel):
     total_testcases: Optional[int] = None
 
 
-class CodeAnalysisResponse(BaseModel):
+class CodeAnalysisResponse(FastBaseModel):
     """Response from code analysis."""
 
     summary: str
@@ -224,7 +300,7 @@ class CodeAnalysisResponse(BaseModel):
 # ============ Learning Path Models ============
 
 
-class PathProblem(BaseModel):
+class PathProblem(FastBaseModel):
     """A problem within a learning path category."""
 
     slug: str
@@ -233,7 +309,7 @@ class PathProblem(BaseModel):
     order: int
 
 
-class PathCategory(BaseModel):
+class PathCategory(FastBaseModel):
     """A category/pattern group within a learning path."""
 
     name: str
@@ -241,7 +317,7 @@ class PathCategory(BaseModel):
     problems: list[PathProblem]
 
 
-class LearningPath(BaseModel):
+class LearningPath(FastBaseModel):
     """A structured learning path (e.g., NeetCode 150, Blind 75)."""
 
     id: UUID
@@ -253,7 +329,7 @@ class LearningPath(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-class LearningPathSummary(BaseModel):
+class LearningPathSummary(FastBaseModel):
     """Summary view of a learning path (without full problem details)."""
 
     id: UUID
@@ -262,7 +338,7 @@ class LearningPathSummary(BaseModel):
     total_problems: int
 
 
-class UserPathProgress(BaseModel):
+class UserPathProgress(FastBaseModel):
     """User's progress on a specific learning path."""
 
     id: UUID
@@ -274,23 +350,40 @@ class UserPathProgress(BaseModel):
     last_activity_at: Optional[datetime] = None
 
 
-class PathProgressResponse(BaseModel):
+class CategoryProblemStatus(FastBaseModel):
+    """Completion state of one problem within a path category."""
+
+    slug: str
+    title: str
+    difficulty: Optional[Difficulty] = None
+    completed: bool = False
+
+
+class CategoryProgress(FastBaseModel):
+    """Progress within a single learning path category."""
+
+    total: int = 0
+    completed: int = 0
+    problems: list[CategoryProblemStatus] = []
+
+
+class PathProgressResponse(FastBaseModel):
     """Complete path progress with path details."""
 
     path: LearningPath
     progress: Optional[UserPathProgress] = None
     completed_count: int = 0
     completion_percentage: float = 0.0
-    categories_progress: dict[str, dict] = {}  # {category_name: {total, completed, problems}}
+    categories_progress: dict[str, CategoryProgress] = {}
 
 
-class CompleteProblemRequest(BaseModel):
+class CompleteProblemRequest(FastBaseModel):
     """Request to mark a problem as completed in a path."""
 
     problem_slug: str
 
 
-class SetCurrentPathRequest(BaseModel):
+class SetCurrentPathRequest(FastBaseModel):
     """Request to set user's current learning path."""
 
     path_id: UUID
@@ -299,9 +392,11 @@ class SetCurrentPathRequest(BaseModel):
 # ============ Today's Focus Models ============
 
 
-class DailyFocusProblem(BaseModel):
+class DailyFocusProblem(FastBaseModel):
     """A problem recommended for today's focus."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     slug: str
     title: str
     difficulty: Optional[Difficulty] = None
@@ -310,7 +405,7 @@ class DailyFocusProblem(BaseModel):
     priority: int  # 1 = highest priority
 
 
-class TodaysFocus(BaseModel):
+class TodaysFocus(FastBaseModel):
     """Daily mission data for Today's Focus page."""
 
     user_id: UUID
@@ -327,22 +422,31 @@ class TodaysFocus(BaseModel):
 # ============ Mastery Models ============
 
 
-class DomainScore(BaseModel):
+class SubPattern(FastBaseModel):
+    """Score for a single tag within a DSA domain."""
+
+    name: str
+    score: float = 0.0
+    attempted: int = 0
+    solved: int = 0
+
+
+class DomainScore(FastBaseModel):
     """Score for a specific DSA domain."""
 
     name: str
-    score: float = Field(ge=0, le=100, default=0.0)
+    score: Annotated[float, Field(ge=0.0, le=100.0)] = 0.0
     status: str  # "WEAK", "FAIR", "GOOD", "STRONG"
     problems_attempted: int = 0
     problems_solved: int = 0
-    sub_patterns: list[dict] = []  # [{name, score, attempted}]
+    sub_patterns: list[SubPattern] = []
 
 
-class MasteryResponse(BaseModel):
+class MasteryResponse(FastBaseModel):
     """Complete mastery/readiness data for a user."""
 
     user_id: UUID
-    readiness_score: float = Field(ge=0, le=100, default=0.0)
+    readiness_score: Annotated[float, Field(ge=0.0, le=100.0)] = 0.0
     readiness_summary: str = ""
     domains: list[DomainScore] = []
     weak_areas: list[str] = []
@@ -350,71 +454,25 @@ class MasteryResponse(BaseModel):
     generated_at: datetime
 
 
-class DomainDetailResponse(BaseModel):
+class DomainDetailResponse(FastBaseModel):
     """Detailed breakdown of a specific domain."""
 
     domain: DomainScore
     failure_analysis: Optional[str] = None
     recommended_path: list[PathProblem] = []
-    recent_submissions: list[Submission] = []
+    recent_submissions: list[SubmissionSummary] = []
 
 
 # ============ Daily Mission Models ============
 
 
-class QuestStatus(str, Enum):
-    """Status of a quest in the daily mission."""
-
-    COMPLETED = "completed"
-    CURRENT = "current"
-    UPCOMING = "upcoming"
-
-
-class MainQuest(BaseModel):
-    """A problem in the main quest lineup (from learning path)."""
-
-    slug: str
-    title: str
-    difficulty: Optional[Difficulty] = None
-    category: str
-    order: int
-    status: QuestStatus = QuestStatus.UPCOMING
-
-
-class SideQuest(BaseModel):
-    """A side quest problem targeting a weakness."""
-
-    slug: str
-    title: str
-    difficulty: Optional[Difficulty] = None
-    reason: str  # Why this problem is recommended
-    source_problem_slug: Optional[str] = None  # Problem that revealed the weakness
-    target_weakness: str  # Skill/pattern being reinforced
-    quest_type: str = "skill_gap"  # "review_due", "skill_gap", "slow_solve"
-    completed: bool = False
-
-
-class MissionResponse(BaseModel):
-    """Complete daily mission data for Mission Control dashboard."""
-
-    user_id: UUID
-    mission_date: str  # ISO date string
-    objective: Optional[dict] = None
-    main_quests: list[MainQuest] = []
-    side_quests: list[SideQuest] = []
-    streak: int = 0
-    total_completed_today: int = 0
-    can_regenerate: bool = True  # False if regenerated 3+ times
-    generated_at: datetime
-
-
-class MissionGenerateRequest(BaseModel):
+class MissionGenerateRequest(FastBaseModel):
     """Request to generate or regenerate a mission."""
 
     force_regenerate: bool = False
 
 
-class ProblemAttemptStats(BaseModel):
+class ProblemAttemptStats(FastBaseModel):
     """Stats about a user's attempts on a specific problem."""
 
     user_id: UUID
@@ -435,7 +493,7 @@ class ProblemAttemptStats(BaseModel):
 # ============ Onboarding Models ============
 
 
-class OnboardingStatus(BaseModel):
+class OnboardingStatus(FastBaseModel):
     """User's onboarding progress."""
 
     user_id: UUID
@@ -444,7 +502,7 @@ class OnboardingStatus(BaseModel):
     history_imported: bool = False
     first_path_selected: bool = False
     onboarding_complete: bool = False
-    current_step: int = Field(ge=1, le=4, default=1)
+    current_step: Annotated[int, Field(ge=1, le=4)] = 1
     extension_verified_at: Optional[datetime] = None
     history_imported_at: Optional[datetime] = None
     problems_imported_count: int = 0
@@ -452,7 +510,7 @@ class OnboardingStatus(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-class OnboardingStepUpdate(BaseModel):
+class OnboardingStepUpdate(FastBaseModel):
     """Request to update an onboarding step."""
 
     step: str  # "winrate", "extension", "history", "path"
@@ -463,17 +521,17 @@ class OnboardingStepUpdate(BaseModel):
 # ============ Gemini Mission v2 Models ============
 
 
-class SkillScoreContext(BaseModel):
+class SkillScoreContext(FastBaseModel):
     """Skill score context for Gemini mission generation."""
 
     domain: str
-    score: float = Field(ge=0, le=100)
+    score: Annotated[float, Field(ge=0.0, le=100.0)]
     status: str  # "weak", "developing", "proficient", "mastered"
     recent_failures: int = 0
     average_solve_time: Optional[float] = None
 
 
-class ReviewItemContext(BaseModel):
+class ReviewItemContext(FastBaseModel):
     """Review queue item context for Gemini."""
 
     problem_id: str
@@ -482,7 +540,7 @@ class ReviewItemContext(BaseModel):
     interval: int  # Current spaced repetition interval
 
 
-class PathContext(BaseModel):
+class PathContext(FastBaseModel):
     """Current learning path context for Gemini."""
 
     id: str
@@ -493,7 +551,7 @@ class PathContext(BaseModel):
     current_category: Optional[str] = None
 
 
-class GeminiMissionContext(BaseModel):
+class GeminiMissionContext(FastBaseModel):
     """Complete context sent to Gemini for mission generation."""
 
     # Win rate targets
@@ -519,7 +577,7 @@ class GeminiMissionContext(BaseModel):
     recent_slow_solves: list[str] = []  # Problem slugs
 
 
-class MissionProblem(BaseModel):
+class MissionProblem(FastBaseModel):
     """A problem in the Gemini-generated mission with reasoning."""
 
     problem_id: str
@@ -534,7 +592,7 @@ class MissionProblem(BaseModel):
     completed_at: Optional[datetime] = None
 
 
-class GeminiMissionResponse(BaseModel):
+class GeminiMissionResponse(FastBaseModel):
     """Gemini's response for daily mission generation."""
 
     daily_objective: str  # "Build pattern recognition in DP"
@@ -544,7 +602,7 @@ class GeminiMissionResponse(BaseModel):
     pacing_note: str  # "You're 2 days ahead of schedule"
 
 
-class DailyMissionResponseV2(BaseModel):
+class DailyMissionResponseV2(FastBaseModel):
     """Complete daily mission response (v2 with Gemini reasoning)."""
 
     user_id: UUID
@@ -563,13 +621,13 @@ class DailyMissionResponseV2(BaseModel):
 # ============ Pattern Analysis Models ============
 
 
-class FocusNotesRequest(BaseModel):
+class FocusNotesRequest(FastBaseModel):
     """Request to update user's focus notes for feed steering."""
 
-    focus_notes: Optional[str] = Field(None, max_length=500)
+    focus_notes: Annotated[Optional[str], Field(max_length=500)] = None
 
 
-class FocusNotesResponse(BaseModel):
+class FocusNotesResponse(FastBaseModel):
     """Response containing user's focus notes."""
 
     user_id: UUID
@@ -577,7 +635,7 @@ class FocusNotesResponse(BaseModel):
     updated_at: Optional[datetime] = None
 
 
-class MistakeJournalEntry(BaseModel):
+class MistakeJournalEntry(FastBaseModel):
     """A mistake journal entry."""
 
     id: UUID
@@ -593,31 +651,31 @@ class MistakeJournalEntry(BaseModel):
     updated_at: datetime
 
 
-class CreateMistakeJournalRequest(BaseModel):
+class CreateMistakeJournalRequest(FastBaseModel):
     """Request to create a mistake journal entry."""
 
-    entry_text: str = Field(..., max_length=1000)
+    entry_text: Annotated[str, Field(max_length=1000)]
     problem_slug: Optional[str] = None
     problem_title: Optional[str] = None
     entry_type: str = "general"
     feed_item_id: Optional[UUID] = None
 
 
-class UpdateMistakeJournalRequest(BaseModel):
+class UpdateMistakeJournalRequest(FastBaseModel):
     """Request to update a mistake journal entry."""
 
-    entry_text: Optional[str] = Field(None, max_length=1000)
+    entry_text: Annotated[Optional[str], Field(max_length=1000)] = None
     is_addressed: Optional[bool] = None
 
 
-class MistakeJournalListResponse(BaseModel):
+class MistakeJournalListResponse(FastBaseModel):
     """Response containing a list of journal entries."""
 
     entries: list[MistakeJournalEntry]
     unaddressed_count: int
 
 
-class PatternInsight(BaseModel):
+class PatternInsight(FastBaseModel):
     """A recurring mistake pattern detected across submissions."""
 
     pattern: str
@@ -625,7 +683,7 @@ class PatternInsight(BaseModel):
     example_problems: list[str] = []
 
 
-class UserPatterns(BaseModel):
+class UserPatterns(FastBaseModel):
     """Result of analyzing a user's submission patterns."""
 
     recurring_mistakes: list[PatternInsight] = []
@@ -1,7 +1,7 @@
 """Pydantic schemas for System Design Review feature."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -22,10 +22,10 @@ class TopicInfo(BaseModel):
 class RubricWeights(BaseModel):
     """Rubric dimension weights for grading."""
 
-    depth: int = Field(default=3, ge=1, le=5)
-    tradeoffs: int = Field(default=3, ge=1, le=5)
-    clarity: int = Field(default=2, ge=1, le=5)
-    scalability: int = Field(default=2, ge=1, le=5)
+    depth: Annotated[int, Field(ge=1, le=5)] = 3
+    tradeoffs: Annotated[int, Field(ge=1, le=5)] = 3
+    clarity: Annotated[int, Field(ge=1, le=5)] = 2
+    scalability: Annotated[int, Field(ge=1, le=5)] = 2
 
 
 class SystemDesignTrack(BaseModel):
@@ -114,7 +114,7 @@ class TrackProgressResponse(BaseModel):
 
 
 class SetActiveTrackRequest(BaseModel):
-    """Request to set active system design track."""
+    """Request to set the user's active track."""
 
     track_id: Optional[UUID] = None  # None to clear active track
 
@@ -203,7 +203,7 @@ class DimensionScore(BaseModel):
     """Score for a single rubric dimension with cited evidence."""
 
     name: str  # "technical_depth", "structure_and_approach", etc.
-    score: int = Field(ge=1, le=10)
+    score: Annotated[int, Field(ge=1, le=10)]
     evidence: list[DimensionEvidence] = []
     summary: str
 
@@ -241,7 +241,7 @@ class FollowUpGradeResult(BaseModel):
     """Simplified grading result for a follow-up question response."""
 
     transcript: str
-    score: int = Field(ge=1, le=10)
+    score: Annotated[int, Field(ge=1, le=10)]
     feedback: str
     addressed_gap: bool
 
@@ -1,7 +1,7 @@
 """Pydantic schemas for win rate targeting system."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -19,10 +19,10 @@ class WinRateTargets(BaseModel):
 
 
 class SetWinRateTargetsRequest(BaseModel):
-    easy_target: float = Field(default=0.90, ge=0.0, le=1.0)
-    medium_target: float = Field(default=0.70, ge=0.0, le=1.0)
-    hard_target: float = Field(default=0.50, ge=0.0, le=1.0)
-    optimality_threshold: float = Field(default=70.0, ge=0.0, le=100.0)
+    easy_target: Annotated[float, Field(ge=0.0, le=1.0)] = 0.90
+    medium_target: Annotated[float, Field(ge=0.0, le=1.0)] = 0.70
+    hard_target: Annotated[float, Field(ge=0.0, le=1.0)] = 0.50
+    optimality_threshold: Annotated[float, Field(ge=0.0, le=100.0)] = 70.0
 
 
 class DifficultyWinRate(BaseModel):
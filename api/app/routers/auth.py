@@ -1,14 +1,58 @@
 """Auth router for extension token management."""
 
+import logging
 from typing import Optional
 
+import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
 from app.auth import AuthenticatedUser, get_current_user
+from app.config import get_settings
 from app.db.supabase import get_supabase_admin_client
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Shared client for GoTrue calls, so refreshes reuse keep-alive connections
+_http: Optional[httpx.AsyncClient] = None
+
+# GoTrue refresh URL and headers, built once from settings on first use
+_refresh_url: Optional[str] = None
+_refresh_headers: Optional[dict[str, str]] = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _http
+
+
+def _refresh_target() -> tuple[str, dict[str, str]]:
+    global _refresh_url, _refresh_headers
+    if _refresh_url is None:
+        settings = get_settings()
+        _refresh_url = f"{settings.supabase_url}/auth/v1/token?grant_type=refresh_token"
+        _refresh_headers = {
+            "apikey": settings.supabase_anon_key,
+            "Content-Type": "application/json",
+        }
+    return _refresh_url, _refresh_headers
+
+
+async def close_http_client() -> None:
+    """Close the shared GoTrue client on shutdown."""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
 
 
 class RefreshRequest(BaseModel):
@@ -16,6 +60,8 @@ class RefreshRequest(BaseModel):
 
 
 class TokenResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     access_token: str
     refresh_token: str
     expires_in: int
@@ -26,55 +72,60 @@ class MigrateRequest(BaseModel):
     guest_id: str
 
 
+class MigratedSummary(BaseModel):
+    """Row counts moved by the migrate_guest_to_auth RPC."""
+
+    submissions: int = 0
+    skill_scores: int = 0
+    review_queue: int = 0
+    user_settings: int = 0
+
+
 class MigrateResponse(BaseModel):
     success: bool
-    migrated: Optional[dict] = None
+    migrated: Optional[MigratedSummary] = None
     error: Optional[str] = None
 
 
 class MeResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: str
     email: Optional[str] = None
 
 
 @router.post("/auth/refresh", response_model=TokenResponse)
-async def refresh_token(body: RefreshRequest) -> TokenResponse:
+async def refresh_token(body: RefreshRequest) -> ORJSONResponse:
     """Refresh an expired access token using a refresh token.
 
     No auth required since the access token is expired.
     Proxies to the Supabase GoTrue refresh endpoint.
     """
-    import httpx
-    from app.config import get_settings
-
-    settings = get_settings()
-    url = f"{settings.supabase_url}/auth/v1/token?grant_type=refresh_token"
+    url, headers = _refresh_target()
 
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                url,
-                json={"refresh_token": body.refresh_token},
-                headers={
-                    "apikey": settings.supabase_anon_key,
-                    "Content-Type": "application/json",
-                },
-            )
+        resp = await _get_http().post(
+            url,
+            json={"refresh_token": body.refresh_token},
+            headers=headers,
+        )
 
         if resp.status_code != 200:
-            detail = resp.text
+            content = resp.content
             try:
-                detail = resp.json().get("error_description", resp.text)
-            except Exception:
-                pass
+                detail = orjson.loads(content).get("error_description")
+            except (orjson.JSONDecodeError, AttributeError):
+                detail = None
+            detail = detail or content.decode("utf-8", "replace")
             raise HTTPException(status_code=401, detail=f"Refresh failed: {detail}")
 
-        data = resp.json()
-        return TokenResponse(
-            access_token=data["access_token"],
-            refresh_token=data["refresh_token"],
-            expires_in=data.get("expires_in", 3600),
-        )
+        data = orjson.loads(resp.content)
+        return ORJSONResponse(content={
+            "access_token": data["access_token"],
+            "refresh_token": data["refresh_token"],
+            "expires_in": data.get("expires_in", 3600),
+            "token_type": "bearer",
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -85,7 +136,7 @@ async def refresh_token(body: RefreshRequest) -> TokenResponse:
 async def migrate_guest_data(
     body: MigrateRequest,
     user: AuthenticatedUser = Depends(get_current_user),
-) -> MigrateResponse:
+) -> ORJSONResponse:
     """Migrate guest data to the authenticated user.
 
     Calls the migrate_guest_to_auth RPC on Supabase using the admin client.
@@ -97,22 +148,26 @@ async def migrate_guest_data(
             "p_auth_id": user.id,
         }).execute()
 
+        # The RPC's json_build_object output is trusted, so skip validation
         if result.data and isinstance(result.data, dict):
-            return MigrateResponse(
+            migrated = result.data.get("migrated")
+            response = MigrateResponse.model_construct(
                 success=result.data.get("success", False),
-                migrated=result.data.get("migrated"),
+                migrated=MigratedSummary.model_construct(**migrated) if migrated else None,
                 error=result.data.get("error"),
             )
+        else:
+            response = MigrateResponse.model_construct(success=True, migrated=None, error=None)
 
-        return MigrateResponse(success=True, migrated=result.data)
+        return ORJSONResponse(content=response.model_dump())
     except Exception as e:
-        print(f"[Auth] Migration error: {e}")
-        return MigrateResponse(success=False, error=str(e))
+        logger.exception("Guest migration failed for guest %s", body.guest_id)
+        return ORJSONResponse(content={"success": False, "migrated": None, "error": str(e)})
 
 
 @router.get("/auth/me", response_model=MeResponse)
 async def get_me(
     user: AuthenticatedUser = Depends(get_current_user),
-) -> MeResponse:
+) -> ORJSONResponse:
     """Return the current user info from the JWT."""
-    return MeResponse(id=user.id, email=user.email)
+    return ORJSONResponse(content={"id": user.id, "email": user.email})
@@ -1,49 +1,275 @@
 """Coaching endpoints for AI-powered assistance."""
 
 import asyncio
-from typing import Annotated, AsyncGenerator
+import hashlib
+import logging
+import re
+import time
+from typing import Annotated, AsyncGenerator, AsyncIterator, Callable, Coroutine, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from supabase import Client
 
-from app.db.supabase import get_supabase
+from app.auth import AuthenticatedUser, get_current_user
+from app.db.supabase import get_postgrest, get_supabase
 from app.models.schemas import (
     ChatRequest,
     ChatResponse,
     CodeAnalysisRequest,
     CodeAnalysisResponse,
+    TipsBatchRequest,
 )
 from app.services.code_analyzer import CodeAnalyzer
-from app.services.gemini_gateway import GeminiGateway
+from app.services.gemini_gateway import GeminiGateway, TipsGenerationError, get_gemini_gateway
 from app.services.pattern_analyzer import get_pattern_analyzer
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
+# 500 detail prefix per endpoint, applied by _CoachingRoute
+_ERROR_PREFIXES = {
+    "chat": "Chat failed",
+    "chat_stream": "Stream failed",
+    "analyze_code": "Analysis failed",
+    "get_personalized_tips": "Failed to generate tips",
+    "get_personalized_tips_batch": "Failed to generate tips",
+    "get_patterns": "Pattern analysis failed",
+}
 
-def _query_previous_attempts(supabase: Client, user_id: str, problem_slug: str, exclude_submission_id: str = None) -> list[dict]:
-    """Query previous attempts on the same problem for context."""
-    query = (
-        supabase.table("submissions")
-        .select("status, status_msg, total_correct, total_testcases, language, submitted_at")
-        .eq("user_id", user_id)
-        .eq("problem_slug", problem_slug)
-        .order("submitted_at", desc=True)
-        .limit(5)
+
+class _CoachingRoute(APIRoute):
+    """Route that turns unexpected handler errors into a JSON 500.
+
+    HTTP and validation errors propagate to FastAPI's handlers unchanged, so
+    handlers need no try/except of their own. The 500 is returned inside the
+    middleware stack (unlike an app-level Exception handler, which runs in
+    ServerErrorMiddleware), so CORS headers are still applied.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        handler = super().get_route_handler()
+        prefix = _ERROR_PREFIXES.get(self.name, "Request failed")
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                logger.exception("%s %s failed", request.method, request.url.path)
+                return ORJSONResponse(status_code=500, content={"detail": f"{prefix}: {str(e)}"})
+
+        return route_handler
+
+
+router = APIRouter(route_class=_CoachingRoute, default_response_class=ORJSONResponse)
+
+# Each per-user cache below holds at most this many entries; bounds memory by
+# active users, not all users ever seen
+_COACHING_CACHE_MAX = 10_000
+
+# Per-user weakest skills, shared by chat context and tips
+_weak_skills_cache: dict[str, tuple[float, list[dict]]] = {}
+_WEAK_SKILLS_CACHE_TTL = 60  # 1 minute
+_WEAK_SKILLS_LIMIT = 5
+# In-flight lookups, so concurrent cache misses for a user share one query
+_weak_skills_inflight: dict[str, asyncio.Future] = {}
+
+# Per-user generated tips, tagged with a hash of the context they came from;
+# dropped when the user stores a new submission
+_tips_cache: dict[str, tuple[float, str, list[str]]] = {}
+_TIPS_CACHE_TTL = 600  # 10 minutes
+_TIPS_CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=600"
+
+# Per-user chat context string, tagged with the (submission_id, current_problem) it was built for
+_context_cache: dict[str, tuple[float, tuple, str]] = {}
+_CONTEXT_CACHE_TTL = 30  # seconds
+
+# SSE batching: the first chunk is sent immediately, later ones are coalesced
+_SSE_LINGER_SECONDS = 0.02
+_SSE_QUEUE_SIZE = 64
+# Idle proxies (nginx, ALB) drop silent streams; ping while the first token is pending
+_SSE_PING_SECONDS = 15
+_STREAM_DONE = object()
+
+# Phrases that mark a follow-up suggestion line, matched in one regex pass
+_SUGGESTION_RE = re.compile(
+    "you might want to|try practicing|consider reviewing|i recommend",
+    re.IGNORECASE,
+)
+
+
+async def _coalesce_chunks(chunks: AsyncIterator[str]) -> AsyncGenerator[Optional[str], None]:
+    """Re-batch a stream of small text chunks to cut per-chunk write overhead.
+
+    A producer task drains ``chunks`` into a bounded queue. The first chunk
+    is passed through straight away to keep time-to-first-token low; each
+    later batch waits up to ``_SSE_LINGER_SECONDS`` for more chunks to join it.
+    Until the first chunk arrives, ``None`` is yielded every
+    ``_SSE_PING_SECONDS`` so the caller can send a keep-alive.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_SSE_QUEUE_SIZE)
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(f"Error: {str(e)}")
+        await queue.put(_STREAM_DONE)
+
+    loop = asyncio.get_running_loop()
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                first = await asyncio.wait_for(queue.get(), _SSE_PING_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                yield None
+        if first is _STREAM_DONE:
+            return
+        yield first
+
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is _STREAM_DONE:
+                break
+            batch = [item]
+            deadline = loop.time() + _SSE_LINGER_SECONDS
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STREAM_DONE:
+                    done = True
+                    break
+                batch.append(item)
+            yield "".join(batch)
+    finally:
+        producer.cancel()
+
+
+def _store_cached(cache: dict[str, tuple], key: str, entry: tuple) -> None:
+    """Cache an ``(expiry, ...)`` entry, purging expired entries and capping the cache size.
+
+    Every entry in a cache shares one TTL, so insertion order is expiry order:
+    expired and overflow entries are always at the front of the dict.
+    """
+    now = time.monotonic()
+    cache.pop(key, None)
+    while cache and (
+        len(cache) >= _COACHING_CACHE_MAX
+        or next(iter(cache.values()))[0] <= now
+    ):
+        del cache[next(iter(cache))]
+    cache[key] = entry
+
+
+async def _weak_skills(postgrest: httpx.AsyncClient, user_id: str) -> list[dict]:
+    """Return the user's weakest skill scores, served from a short TTL cache.
+
+    Concurrent misses for the same user (e.g. chat and tips fired together)
+    await a single shared query instead of each hitting Supabase.
+    """
+    cached = _weak_skills_cache.get(user_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    pending = _weak_skills_inflight.get(user_id)
+    if pending is None:
+        pending = asyncio.ensure_future(_fetch_weak_skills(postgrest, user_id))
+        _weak_skills_inflight[user_id] = pending
+        pending.add_done_callback(lambda _: _weak_skills_inflight.pop(user_id, None))
+    # Shielded so one cancelled caller doesn't cancel the lookup for the others
+    return await asyncio.shield(pending)
+
+
+async def _fetch_weak_skills(postgrest: httpx.AsyncClient, user_id: str) -> list[dict]:
+    resp = await postgrest.get(
+        "/skill_scores",
+        params={
+            "select": "tag,score",
+            "user_id": f"eq.{user_id}",
+            "order": "score",
+            "limit": _WEAK_SKILLS_LIMIT,
+        },
     )
-    response = query.execute()
-    attempts = response.data or []
-    # Filter out the current submission if provided
+    resp.raise_for_status()
+    skills = resp.json()
+    _store_cached(_weak_skills_cache, user_id, (time.monotonic() + _WEAK_SKILLS_CACHE_TTL, skills))
+    return skills
+
+
+def _context_hash(context: dict) -> str:
+    return hashlib.blake2b(orjson.dumps(context, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+def _fresh_tips(user_id: str, context_hash: str) -> Optional[list[str]]:
+    cached = _tips_cache.get(user_id)
+    if cached and cached[0] > time.monotonic() and cached[1] == context_hash:
+        return cached[2]
+    return None
+
+
+async def _cached_tips(gateway: GeminiGateway, user_id: str, context: dict) -> list[str]:
+    """Generate tips for a context, reusing the user's last result if the context is unchanged."""
+    context_hash = _context_hash(context)
+    cached = _fresh_tips(user_id, context_hash)
+    if cached is not None:
+        return cached
+
+    try:
+        tips = await gateway.generate_tips(context)
+    except TipsGenerationError as e:
+        # Served but not cached, so the next request retries Gemini
+        return [f"Unable to generate tips: {e}"]
+    _store_cached(_tips_cache, user_id, (time.monotonic() + _TIPS_CACHE_TTL, context_hash, tips))
+    return tips
+
+
+def invalidate_coaching_cache(user_id: str) -> None:
+    """Drop a user's cached weak skills, tips and chat context, e.g. after a new submission."""
+    _weak_skills_cache.pop(user_id, None)
+    _tips_cache.pop(user_id, None)
+    _context_cache.pop(user_id, None)
+
+
+async def _query_previous_attempts(
+    postgrest: httpx.AsyncClient,
+    user_id: str,
+    problem_slug: str,
+    exclude_submission_id: str = None,
+) -> list[dict]:
+    """Query previous attempts on the same problem for context."""
+    params = {
+        "select": "status,status_msg,total_correct,total_testcases,language,submitted_at",
+        "user_id": f"eq.{user_id}",
+        "problem_slug": f"eq.{problem_slug}",
+        "order": "submitted_at.desc",
+        "limit": 5,
+    }
+    # Leave out the current submission if provided
     if exclude_submission_id:
-        attempts = [a for a in attempts if a.get("id") != exclude_submission_id]
-    return attempts
+        params["id"] = f"neq.{exclude_submission_id}"
+    resp = await postgrest.get("/submissions", params=params)
+    resp.raise_for_status()
+    return resp.json()
 
 
 @router.post("/coaching/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
-    supabase: Annotated[Client, Depends(get_supabase)] = None,
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
+    gateway: Annotated[GeminiGateway, Depends(get_gemini_gateway)] = None,
 ):
     """
     Interactive coaching chat endpoint.
@@ -52,66 +278,68 @@ async def chat(
     - current_problem: slug of problem being worked on
     - submission_id: recent submission to discuss
     """
-    try:
-        gateway = GeminiGateway()
-
-        # Build context from user's data
-        context_str = await _build_context(supabase, request)
-
-        # Generate response
-        response = await gateway.chat(
-            message=request.message,
-            history=request.history,
-            system_context=context_str,
-        )
+    # Build context from user's data
+    context_str = await _build_context(postgrest, request)
+
+    # Generate response
+    response = await gateway.chat(
+        message=request.message,
+        history=request.history,
+        system_context=context_str,
+    )
 
-        return ChatResponse(
-            message=response,
-            suggestions=_extract_suggestions(response),
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+    return ChatResponse(
+        message=response,
+        suggestions=_extract_suggestions(response),
+    )
 
 
 @router.post("/coaching/chat/stream")
 async def chat_stream(
     request: ChatRequest,
-    supabase: Annotated[Client, Depends(get_supabase)] = None,
+    http_request: Request,
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
+    gateway: Annotated[GeminiGateway, Depends(get_gemini_gateway)] = None,
 ):
     """
     Streaming chat endpoint using Server-Sent Events.
 
-    Returns SSE stream of chat response chunks.
+    Returns SSE stream of chat response chunks. If the client goes away
+    mid-stream, the upstream Gemini call is cancelled.
     """
-    try:
-        gateway = GeminiGateway()
-        context_str = await _build_context(supabase, request)
-
-        async def generate() -> AsyncGenerator[str, None]:
-            async for chunk in gateway.chat_stream(
-                message=request.message,
-                history=request.history,
-                system_context=context_str,
-            ):
-                yield f"data: {chunk}\n\n"
-            yield "data: [DONE]\n\n"
+    context_str = await _build_context(postgrest, request)
 
-        return StreamingResponse(
-            generate(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-            },
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Stream failed: {str(e)}")
+    async def generate() -> AsyncGenerator[str, None]:
+        chunks = _coalesce_chunks(gateway.chat_stream(
+            message=request.message,
+            history=request.history,
+            system_context=context_str,
+        ))
+        try:
+            async for chunk in chunks:
+                if await http_request.is_disconnected():
+                    return
+                yield ": ping\n\n" if chunk is None else f"data: {chunk}\n\n"
+            yield "data: [DONE]\n\n"
+        finally:
+            # Closing the coalescer cancels its producer and the Gemini stream
+            await chunks.aclose()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @router.post("/coaching/analyze", response_model=CodeAnalysisResponse)
 async def analyze_code(
     request: CodeAnalysisRequest,
-    supabase: Annotated[Client, Depends(get_supabase)] = None,
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
 ):
     """
     Analyze submitted code for issues and improvements.
@@ -123,122 +351,122 @@ async def analyze_code(
     - Pattern type and concept gap classification
     - Time/space complexity analysis
     """
-    try:
-        analyzer = CodeAnalyzer()
-
-        # Query previous attempts on this problem for context
-        previous_attempts = _query_previous_attempts(
-            supabase,
-            str(request.user_id),
-            request.problem_slug,
-            str(request.submission_id),
-        )
+    analyzer = CodeAnalyzer()
+    user_id_str = str(request.user_id)
+    submission_id_str = str(request.submission_id)
+
+    # Query previous attempts on this problem for context
+    previous_attempts = await _query_previous_attempts(
+        postgrest,
+        user_id_str,
+        request.problem_slug,
+        submission_id_str,
+    )
 
-        analysis = await analyzer.analyze(
-            code=request.code,
-            language=request.language,
-            problem_slug=request.problem_slug,
-            status=request.status.value,
-            code_output=request.code_output,
-            expected_output=request.expected_output,
-            status_msg=request.status_msg,
-            total_correct=request.total_correct,
-            total_testcases=request.total_testcases,
-            previous_attempts=previous_attempts,
-        )
+    analysis = await analyzer.analyze(
+        code=request.code,
+        language=request.language,
+        problem_slug=request.problem_slug,
+        status=request.status.value,
+        code_output=request.code_output,
+        expected_output=request.expected_output,
+        status_msg=request.status_msg,
+        total_correct=request.total_correct,
+        total_testcases=request.total_testcases,
+        previous_attempts=previous_attempts,
+    )
 
-        # Store insight for feedback loop (non-blocking)
-        if analysis.pattern_type or analysis.concept_gap or analysis.root_cause:
-            try:
-                supabase.table("submission_insights").insert({
-                    "submission_id": str(request.submission_id),
-                    "user_id": str(request.user_id),
+    # Store insight for feedback loop (non-blocking)
+    if analysis.pattern_type or analysis.concept_gap or analysis.root_cause:
+        try:
+            resp = await postgrest.post(
+                "/submission_insights",
+                json={
+                    "submission_id": submission_id_str,
+                    "user_id": user_id_str,
                     "pattern_type": analysis.pattern_type,
                     "concept_gap": analysis.concept_gap,
                     "root_cause": analysis.root_cause,
-                }).execute()
-            except Exception:
-                pass  # Don't fail analysis if insight storage fails
+                },
+                headers={"Prefer": "return=minimal"},
+            )
+            resp.raise_for_status()
+        except Exception:
+            pass  # Don't fail analysis if insight storage fails
 
-        return analysis
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    return analysis
 
 
 @router.get("/coaching/tips/{user_id}")
 async def get_personalized_tips(
     user_id: UUID,
-    supabase: Annotated[Client, Depends(get_supabase)] = None,
+    http_request: Request,
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
+    gateway: Annotated[GeminiGateway, Depends(get_gemini_gateway)] = None,
 ):
-    """Get personalized tips based on user's recent performance, pattern analysis, and submission insights."""
-    try:
-        gateway = GeminiGateway()
-        user_id_str = str(user_id)
-
-        # Get recent failures with error context
-        failures = (
-            supabase.table("submissions")
-            .select("problem_slug, status, tags, status_msg, total_correct, total_testcases")
-            .eq("user_id", user_id_str)
-            .neq("status", "Accepted")
-            .order("submitted_at", desc=True)
-            .limit(5)
-            .execute()
-        )
-
-        # Get weak skills
-        weak_skills = (
-            supabase.table("skill_scores")
-            .select("tag, score")
-            .eq("user_id", user_id_str)
-            .order("score")
-            .limit(5)
-            .execute()
-        )
+    """Get personalized tips based on user's recent performance, pattern analysis, and submission insights.
 
-        # Get cached pattern analysis
-        pattern_analysis = {}
-        try:
-            pattern_resp = (
-                supabase.table("user_pattern_analysis")
-                .select("patterns")
-                .eq("user_id", user_id_str)
-                .limit(1)
-                .execute()
-            )
-            if pattern_resp.data:
-                pattern_analysis = pattern_resp.data[0].get("patterns", {})
-        except Exception:
-            pass
+    Tips change slowly, so clients may reuse them for a minute and serve them
+    stale while revalidating; a matching If-None-Match gets a bodiless 304.
+    """
+    user_id_str = str(user_id)
+    context = await _tips_context(postgrest, user_id_str)
+    tips = await _cached_tips(gateway, user_id_str, context)
+
+    body = orjson.dumps({"tips": tips})
+    headers = {
+        "Cache-Control": _TIPS_CACHE_CONTROL,
+        "ETag": f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+    }
+    if http_request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/coaching/tips/batch")
+async def get_personalized_tips_batch(
+    request: TipsBatchRequest,
+    user: AuthenticatedUser = Depends(get_current_user),
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
+    gateway: Annotated[GeminiGateway, Depends(get_gemini_gateway)] = None,
+):
+    """Get personalized tips for several users, generating all uncached ones in one Gemini call.
 
-        # Get recent submission insights
-        submission_insights = []
+    Each context fetch and the LLM call are billed per user, so callers may
+    only request tips for their own id.
+    """
+    user_ids = list(dict.fromkeys(str(u) for u in request.user_ids))
+    if any(uid != user.id for uid in user_ids):
+        raise HTTPException(status_code=403, detail="Tips can only be requested for your own user")
+    contexts = await asyncio.gather(*(_tips_context(postgrest, uid) for uid in user_ids))
+
+    tips: dict[str, list[str]] = {}
+    misses: dict[str, dict] = {}
+    hashes: dict[str, str] = {}
+    for uid, context in zip(user_ids, contexts):
+        hashes[uid] = _context_hash(context)
+        cached = _fresh_tips(uid, hashes[uid])
+        if cached is not None:
+            tips[uid] = cached
+        else:
+            misses[uid] = context
+
+    if misses:
         try:
-            insights_resp = (
-                supabase.table("submission_insights")
-                .select("pattern_type, concept_gap")
-                .eq("user_id", user_id_str)
-                .order("created_at", desc=True)
-                .limit(15)
-                .execute()
-            )
-            if insights_resp.data:
-                submission_insights = insights_resp.data
-        except Exception:
-            pass
-
-        context = {
-            "recent_failures": failures.data if failures.data else [],
-            "weak_skills": weak_skills.data if weak_skills.data else [],
-            "pattern_analysis": pattern_analysis,
-            "submission_insights": submission_insights,
-        }
-
-        tips = await gateway.generate_tips(context)
-
-        return {"tips": tips}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate tips: {str(e)}")
+            generated = await gateway.generate_tips_batch(misses)
+        except TipsGenerationError as e:
+            # Served but not cached, so the next request retries Gemini
+            fallback = [f"Unable to generate tips: {e}"]
+            for uid in misses:
+                tips[uid] = fallback
+        else:
+            expires = time.monotonic() + _TIPS_CACHE_TTL
+            for uid in misses:
+                tips[uid] = generated.get(uid) or []
+                if tips[uid]:
+                    _store_cached(_tips_cache, uid, (expires, hashes[uid], tips[uid]))
+
+    return {"tips": {uid: tips[uid] for uid in user_ids}}
 
 
 @router.get("/patterns/{user_id}")
@@ -251,69 +479,90 @@ async def get_patterns(
 
     Returns cached analysis if fresh, otherwise generates new analysis via Gemini.
     """
-    try:
-        analyzer = get_pattern_analyzer(supabase)
-        patterns = await analyzer.analyze_patterns(user_id)
-        return patterns
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pattern analysis failed: {str(e)}")
+    analyzer = get_pattern_analyzer(supabase)
+    patterns = await analyzer.analyze_patterns(user_id)
+    return patterns
+
 
+async def _tips_context(postgrest: httpx.AsyncClient, user_id: str) -> dict:
+    """Fetch failures, weak skills, cached patterns and insights in one round trip."""
+    resp = await postgrest.post("/rpc/get_coaching_context", json={"p_user_id": user_id})
+    resp.raise_for_status()
+    data = resp.json() or {}
+    weak_skills = data.get("weak_skills") or []
+    _store_cached(_weak_skills_cache, user_id, (time.monotonic() + _WEAK_SKILLS_CACHE_TTL, weak_skills))
 
-async def _build_context(supabase: Client, request: ChatRequest) -> str:
+    return {
+        "recent_failures": data.get("failures") or [],
+        "weak_skills": weak_skills,
+        "pattern_analysis": data.get("pattern_analysis") or {},
+        "submission_insights": data.get("submission_insights") or [],
+    }
+
+
+async def _build_context(postgrest: httpx.AsyncClient, request: ChatRequest) -> str:
     """Build context string from user data for the AI."""
+    user_id_str = str(request.user_id)
+    submission_id = request.context.get("submission_id") if request.context else None
+    current_problem = request.context.get("current_problem") if request.context else None
+
+    context_key = (submission_id, current_problem)
+    cached = _context_cache.get(user_id_str)
+    if cached and cached[0] > time.monotonic() and cached[1] == context_key:
+        return cached[2]
+
     context_parts = []
 
+    async def _q_submission() -> dict:
+        resp = await postgrest.get(
+            "/submission_briefs",
+            params={"select": "status,problem_slug,language,code", "id": f"eq.{submission_id}"},
+            headers={"Accept": "application/vnd.pgrst.object+json"},
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    # Fetch the referenced submission and the user's weak areas in parallel
+    if submission_id:
+        sub, weak = await asyncio.gather(
+            _q_submission(),
+            _weak_skills(postgrest, user_id_str),
+        )
+    else:
+        sub, weak = None, await _weak_skills(postgrest, user_id_str)
+
     # Add explicit context from request
-    if request.context:
-        if "current_problem" in request.context:
-            context_parts.append(f"User is working on: {request.context['current_problem']}")
-
-        if "submission_id" in request.context:
-            # Fetch submission details
-            sub = (
-                supabase.table("submissions")
-                .select("*")
-                .eq("id", request.context["submission_id"])
-                .single()
-                .execute()
-            )
-            if sub.data:
-                context_parts.append(f"Recent submission: {sub.data['status']} on {sub.data['problem_slug']}")
-                if sub.data.get("code"):
-                    context_parts.append(f"Code ({sub.data['language']}):\n```\n{sub.data['code'][:1000]}\n```")
-
-    # Get user's weak areas
-    weak = (
-        supabase.table("skill_scores")
-        .select("tag, score")
-        .eq("user_id", str(request.user_id))
-        .order("score")
-        .limit(3)
-        .execute()
-    )
-    if weak.data:
-        weak_tags = [f"{w['tag']} ({w['score']:.0f})" for w in weak.data]
-        context_parts.append(f"User's weak areas: {', '.join(weak_tags)}")
+    if current_problem is not None:
+        context_parts.append(f"User is working on: {current_problem}")
+
+    if sub:
+        context_parts.append(f"Recent submission: {sub['status']} on {sub['problem_slug']}")
+        if sub.get("code"):
+            context_parts.append(f"Code ({sub['language']}):\n```\n{sub['code']}\n```")
+
+    if weak:
+        context_parts.append("User's weak areas: " + ", ".join(f"{w['tag']} ({w['score']:.0f})" for w in weak[:3]))
 
-    return "\n".join(context_parts) if context_parts else ""
+    context_str = "\n".join(context_parts)
+    _store_cached(_context_cache, user_id_str, (time.monotonic() + _CONTEXT_CACHE_TTL, context_key, context_str))
+    return context_str
 
 
 def _extract_suggestions(response: str) -> list[str]:
     """Extract follow-up suggestions from the response."""
     suggestions = []
 
-    # Look for common patterns in the response
-    suggestion_triggers = [
-        "you might want to",
-        "try practicing",
-        "consider reviewing",
-        "I recommend",
-    ]
-
-    lines = response.split("\n")
-    for line in lines:
-        line_lower = line.lower()
-        if any(trigger in line_lower for trigger in suggestion_triggers):
-            suggestions.append(line.strip())
-
-    return suggestions[:3]  # Limit to 3 suggestions
+    # Search the whole response once per hit and slice out the enclosing line
+    pos = 0
+    while len(suggestions) < 3:  # Limit to 3 suggestions
+        match = _SUGGESTION_RE.search(response, pos)
+        if match is None:
+            break
+        start = response.rfind("\n", 0, match.start()) + 1
+        end = response.find("\n", match.end())
+        if end == -1:
+            end = len(response)
+        suggestions.append(response[start:end].strip())
+        pos = end + 1
+
+    return suggestions
@@ -1,17 +1,28 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 router = APIRouter()
 
+# Bodies never change, so serialize once and hand back the same Response on every probe
+_ROOT_RESPONSE = Response(
+    content=orjson.dumps({"message": "LeetLoop API", "status": "running"}),
+    media_type="application/json",
+)
+_HEALTH_RESPONSE = Response(
+    content=orjson.dumps({"status": "healthy", "service": "leetloop-api"}),
+    media_type="application/json",
+)
 
-@router.get("/")
-async def root():
+
+@router.get("/", response_class=Response)
+async def root() -> Response:
     """Root endpoint."""
-    return {"message": "LeetLoop API", "status": "running"}
+    return _ROOT_RESPONSE
 
 
-@router.get("/health")
-async def health_check():
+@router.get("/health", response_class=Response)
+async def health_check() -> Response:
     """Health check for load balancers and monitoring."""
-    return {"status": "healthy", "service": "leetloop-api"}
+    return _HEALTH_RESPONSE
@@ -1,15 +1,21 @@
 """Language Learning endpoints."""
 
+import asyncio
+import functools
+import logging
 import time
-from datetime import datetime, timedelta
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+import httpx
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from supabase import Client
 
-from app.db.supabase import get_supabase
+from app.db.supabase import get_postgrest, get_supabase, parse_content_range_total
 from app.models.language_schemas import (
+    LANGUAGE_ATTEMPT_HISTORY_ADAPTER,
+    LANGUAGE_REVIEW_ITEMS_ADAPTER,
     BookContentSection,
     BookProgressResponse,
     ChapterProgressItem,
@@ -21,15 +27,12 @@ from app.models.language_schemas import (
     DailyExerciseGrade,
     LanguageAttempt,
     LanguageAttemptGrade,
-    LanguageAttemptHistoryItem,
     LanguageAttemptHistoryResponse,
     LanguageDashboardExercise,
     LanguageDashboardSummary,
     LanguageNextTopicInfo,
     LanguageQuestionContext,
     LanguageReviewItem,
-    LanguageRubricWeights,
-    LanguageTopicInfo,
     LanguageTrack,
     LanguageTrackProgress,
     LanguageTrackProgressResponse,
@@ -46,11 +49,42 @@ from app.services.language_service import (
     get_word_target,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # In-memory TTL cache for language dashboard
 _lang_dashboard_cache: dict[str, tuple[float, LanguageDashboardSummary]] = {}
 _LANG_DASHBOARD_CACHE_TTL = 300  # 5 minutes
+_LANG_DASHBOARD_CACHE_MAX = 10_000  # entries; bounds memory by active users, not all users ever seen
+# Dashboard rebuilds in progress, so a burst of misses for one user runs the queries once
+_lang_dashboard_inflight: dict[str, asyncio.Future] = {}
+
+# Columns read back for full track / attempt / progress payloads
+_TRACK_COLUMNS = (
+    "id, name, description, language, level, topics, total_topics, rubric, source_book, created_at"
+)
+_ATTEMPT_COLUMNS = (
+    "id, user_id, track_id, topic, exercise_type, question_text, expected_answer, "
+    "question_focus_area, question_key_concepts, response_text, word_count, score, verdict, "
+    "feedback, corrections, missed_concepts, status, created_at, graded_at"
+)
+_PROGRESS_COLUMNS = (
+    "id, user_id, track_id, completed_topics, sessions_completed, average_score, "
+    "started_at, last_activity_at"
+)
+# LanguageAttemptHistoryItem's fields; a raw PostgREST select, so no spaces
+_ATTEMPT_HISTORY_SELECT = (
+    "id,topic,exercise_type,question_text,score,verdict,status,created_at,graded_at,"
+    "language_tracks(name)"
+)
+
+# Track rows are effectively static per deploy; shared read-only by every handler.
+# Only complete _TRACK_COLUMNS rows are cached, so every reader can rely on them.
+_track_cache: dict[str, tuple[float, dict]] = {}
+_TRACK_CACHE_TTL = 60  # seconds
+_TRACK_CACHE_MAX = 1_000  # entries
+_TRACK_FIELDS = frozenset(c.strip() for c in _TRACK_COLUMNS.split(","))
 
 
 # ============ Tracks ============
@@ -62,11 +96,10 @@ async def list_tracks(
 ):
     """List all available language tracks."""
     try:
-        response = (
+        response = await _execute(
             supabase.table("language_tracks")
             .select("id, name, description, language, level, total_topics")
             .order("name")
-            .execute()
         )
         return [LanguageTrackSummary(**t) for t in response.data] if response.data else []
     except Exception as e:
@@ -80,33 +113,12 @@ async def get_track(
 ):
     """Get track details with topics."""
     try:
-        response = (
-            supabase.table("language_tracks")
-            .select("*")
-            .eq("id", str(track_id))
-            .single()
-            .execute()
-        )
+        data = await _load_track(supabase, str(track_id))
 
-        if not response.data:
+        if not data:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        data = response.data
-        topics = [LanguageTopicInfo(**t) for t in data.get("topics", [])]
-        rubric = LanguageRubricWeights(**data.get("rubric", {}))
-
-        return LanguageTrack(
-            id=data["id"],
-            name=data["name"],
-            description=data.get("description"),
-            language=data["language"],
-            level=data["level"],
-            topics=topics,
-            total_topics=data.get("total_topics", 0),
-            rubric=rubric,
-            source_book=data.get("source_book"),
-            created_at=data.get("created_at"),
-        )
+        return LanguageTrack.model_validate(_non_null(data))
     except HTTPException:
         raise
     except Exception as e:
@@ -122,63 +134,41 @@ async def get_track_progress(
     """Get user's progress on a specific language track."""
     try:
         # Get track
-        track_response = (
-            supabase.table("language_tracks")
-            .select("*")
-            .eq("id", str(track_id))
-            .single()
-            .execute()
-        )
+        track_data = await _load_track(supabase, str(track_id))
 
-        if not track_response.data:
+        if not track_data:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        track_data = track_response.data
-        topics = [LanguageTopicInfo(**t) for t in track_data.get("topics", [])]
-        rubric = LanguageRubricWeights(**track_data.get("rubric", {}))
-
-        track = LanguageTrack(
-            id=track_data["id"],
-            name=track_data["name"],
-            description=track_data.get("description"),
-            language=track_data["language"],
-            level=track_data["level"],
-            topics=topics,
-            total_topics=track_data.get("total_topics", 0),
-            rubric=rubric,
-            source_book=track_data.get("source_book"),
-            created_at=track_data.get("created_at"),
-        )
+        raw_topics = track_data.get("topics") or []
 
         # Get user progress
-        progress_response = (
+        progress_response = await _execute(
             supabase.table("language_track_progress")
-            .select("*")
+            .select(_PROGRESS_COLUMNS)
             .eq("user_id", str(user_id))
             .eq("track_id", str(track_id))
             .limit(1)
-            .execute()
         )
 
         progress = None
         completion_percentage = 0.0
-        next_topic = None
+        completed_set: set[str] = set()
 
         if progress_response.data:
             progress = LanguageTrackProgress(**progress_response.data[0])
-            completed = len(progress.completed_topics)
-            total = track.total_topics
-            completion_percentage = (completed / total * 100) if total > 0 else 0.0
-
-            for topic in topics:
-                if topic.name not in progress.completed_topics:
-                    next_topic = topic.name
-                    break
-        else:
-            next_topic = topics[0].name if topics else None
+            completed_set = set(progress.completed_topics)
+            total = track_data.get("total_topics") or 0
+            completion_percentage = (len(progress.completed_topics) / total * 100) if total > 0 else 0.0
+
+        # Pick the next topic from the raw rows; the track models are only
+        # built once, for the response payload.
+        next_topic = next(
+            (t["name"] for t in raw_topics if t.get("name") not in completed_set),
+            None,
+        )
 
         return LanguageTrackProgressResponse(
-            track=track,
+            track=LanguageTrack.model_validate(_non_null(track_data)),
             progress=progress,
             completion_percentage=completion_percentage,
             next_topic=next_topic,
@@ -201,28 +191,20 @@ async def get_book_progress(
     """Get chapter-by-chapter book progress for a track."""
     try:
         # Get track
-        track_response = (
-            supabase.table("language_tracks")
-            .select("*")
-            .eq("id", str(track_id))
-            .single()
-            .execute()
-        )
+        track_data = await _load_track(supabase, str(track_id))
 
-        if not track_response.data:
+        if not track_data:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        track_data = track_response.data
         topics = sorted(track_data.get("topics", []), key=lambda t: t.get("order", 0))
 
         # Get user progress
-        progress_response = (
+        progress_response = await _execute(
             supabase.table("language_track_progress")
             .select("completed_topics, average_score")
             .eq("user_id", str(user_id))
             .eq("track_id", str(track_id))
             .limit(1)
-            .execute()
         )
 
         completed_topics = set()
@@ -234,11 +216,10 @@ async def get_book_progress(
         # Get book content for all chapters in this track
         book_content_map: dict[str, dict] = {}
         try:
-            book_response = (
+            book_response = await _execute(
                 supabase.table("book_content")
                 .select("chapter_title, summary, sections, key_concepts")
                 .eq("language_track_id", str(track_id))
-                .execute()
             )
             if book_response.data:
                 for bc in book_response.data:
@@ -249,13 +230,12 @@ async def get_book_progress(
         # Get due reviews for this user + track
         review_topics_map: dict[str, str] = {}
         try:
-            reviews_response = (
+            reviews_response = await _execute(
                 supabase.table("language_review_queue")
                 .select("topic, reason")
                 .eq("user_id", str(user_id))
                 .eq("track_id", str(track_id))
                 .lte("next_review", datetime.utcnow().isoformat())
-                .execute()
             )
             if reviews_response.data:
                 for r in reviews_response.data:
@@ -329,65 +309,54 @@ async def create_attempt(
 ):
     """Create a new language exercise attempt."""
     try:
-        # Get track info
-        track_response = (
-            supabase.table("language_tracks")
-            .select("*")
-            .eq("id", str(request.track_id))
-            .single()
-            .execute()
+        user_id_str = str(user_id)
+        track_id_str = str(request.track_id)
+
+        # Track, recent weak areas and book content are independent reads
+        def _q_weak_areas():
+            try:
+                return _fetch_recent_weak_areas(supabase, user_id_str)
+            except Exception:
+                return []
+
+        def _q_book_content():
+            try:
+                return (
+                    supabase.table("book_content")
+                    .select("chapter_title, summary, key_concepts, case_studies")
+                    .eq("language_track_id", track_id_str)
+                    .eq("chapter_title", request.topic)
+                    .limit(1)
+                    .execute()
+                )
+            except Exception:
+                return None  # Book content is optional
+
+        track_data, weak_areas, book_response = await asyncio.gather(
+            _load_track(supabase, track_id_str),
+            asyncio.to_thread(_q_weak_areas),
+            asyncio.to_thread(_q_book_content),
         )
 
-        if not track_response.data:
+        if not track_data:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        track_data = track_response.data
         topics = track_data.get("topics", [])
 
         # Find topic info
         topic_info = next((t for t in topics if t["name"] == request.topic), None)
         key_concepts = topic_info.get("key_concepts", []) if topic_info else []
 
-        # Get user's previous weak areas from recent attempts
-        weak_areas = []
-        try:
-            recent_attempts = (
-                supabase.table("language_attempts")
-                .select("missed_concepts")
-                .eq("user_id", str(user_id))
-                .eq("status", "graded")
-                .order("graded_at", desc=True)
-                .limit(5)
-                .execute()
-            )
-            if recent_attempts.data:
-                for a in recent_attempts.data:
-                    weak_areas.extend(a.get("missed_concepts") or [])
-                weak_areas = list(set(weak_areas))[:5]
-        except Exception:
-            pass
-
         # Check for book content linked to this track/topic
         book_content = None
-        try:
-            book_response = (
-                supabase.table("book_content")
-                .select("chapter_title, summary, key_concepts, case_studies")
-                .eq("language_track_id", str(request.track_id))
-                .eq("chapter_title", request.topic)
-                .limit(1)
-                .execute()
+        if book_response and book_response.data:
+            bc = book_response.data[0]
+            book_content = BookContentContext(
+                chapter_title=bc.get("chapter_title", ""),
+                summary=bc.get("summary", ""),
+                key_concepts=bc.get("key_concepts", []),
+                case_studies=bc.get("case_studies", []),
             )
-            if book_response.data:
-                bc = book_response.data[0]
-                book_content = BookContentContext(
-                    chapter_title=bc.get("chapter_title", ""),
-                    summary=bc.get("summary", ""),
-                    key_concepts=bc.get("key_concepts", []),
-                    case_studies=bc.get("case_studies", []),
-                )
-        except Exception:
-            pass  # Book content is optional
 
         # Generate exercise via Gemini
         service = get_language_service()
@@ -403,8 +372,8 @@ async def create_attempt(
 
         # Create attempt
         attempt_data = {
-            "user_id": str(user_id),
-            "track_id": str(request.track_id),
+            "user_id": user_id_str,
+            "track_id": track_id_str,
             "topic": request.topic,
             "exercise_type": request.exercise_type,
             "question_text": generated.question_text,
@@ -414,29 +383,17 @@ async def create_attempt(
             "status": "pending",
         }
 
-        response = (
+        response = await _execute(
             supabase.table("language_attempts")
             .insert(attempt_data)
-            .execute()
         )
 
         if not response.data:
             raise HTTPException(status_code=500, detail="Failed to create attempt")
+        _invalidate_lang_dashboard(user_id_str)
 
         attempt = response.data[0]
-        return LanguageAttempt(
-            id=attempt["id"],
-            user_id=attempt["user_id"],
-            track_id=attempt.get("track_id"),
-            topic=attempt["topic"],
-            exercise_type=attempt["exercise_type"],
-            question_text=attempt["question_text"],
-            expected_answer=attempt.get("expected_answer"),
-            question_focus_area=attempt.get("question_focus_area"),
-            question_key_concepts=attempt.get("question_key_concepts") or [],
-            status=attempt["status"],
-            created_at=attempt["created_at"],
-        )
+        return LanguageAttempt.model_validate(_non_null(attempt))
     except HTTPException:
         raise
     except Exception as e:
@@ -447,17 +404,25 @@ async def create_attempt(
 async def submit_attempt(
     attempt_id: UUID,
     request: SubmitLanguageAttemptRequest,
+    background_tasks: BackgroundTasks,
     supabase: Annotated[Client, Depends(get_supabase)] = None,
 ):
-    """Submit response for a language attempt and get AI grading."""
+    """Submit response for a language attempt and get AI grading.
+
+    The graded attempt is saved before the grade is returned; the review
+    queue and track progress writes that follow it run as a background task.
+    """
     try:
         # Get attempt with track info
-        attempt_response = (
+        attempt_response = await _execute(
             supabase.table("language_attempts")
-            .select("*, language_tracks(*)")
+            .select(
+                "user_id, track_id, topic, exercise_type, question_text, expected_answer, "
+                "question_focus_area, question_key_concepts, status, score, verdict, feedback, "
+                "corrections, missed_concepts, language_tracks(language, level)"
+            )
             .eq("id", str(attempt_id))
             .single()
-            .execute()
         )
 
         if not attempt_response.data:
@@ -504,31 +469,39 @@ async def submit_attempt(
             "graded_at": datetime.utcnow().isoformat(),
         }
 
-        supabase.table("language_attempts").update(update_data).eq("id", str(attempt_id)).execute()
-
-        # Add to review queue if score < 7
-        if grading_result.score < 7:
-            user_id = attempt["user_id"]
-            track_id = attempt.get("track_id")
-            try:
-                supabase.table("language_review_queue").upsert({
-                    "user_id": str(user_id),
-                    "track_id": str(track_id) if track_id else None,
-                    "topic": attempt["topic"],
-                    "reason": f"Weak area from {attempt['exercise_type']} exercise on {attempt['topic']}",
-                    "priority": 1,
-                    "interval_days": 1,
-                }, on_conflict="user_id,topic").execute()
-            except Exception:
-                pass
-
-        # Update track progress
-        track_id = attempt.get("track_id")
-        if track_id:
-            _update_language_track_progress(
-                supabase, attempt["user_id"], track_id, attempt["topic"], grading_result.score
+        # Only a still-pending row is claimed, so when two submits race, only
+        # the one that actually graded the attempt counts it. A failure here
+        # leaves the row pending and surfaces as a 500 the client can retry.
+        claimed = await _execute(
+            supabase.table("language_attempts")
+            .update(update_data)
+            .eq("id", str(attempt_id))
+            .eq("status", "pending")
+        )
+        if not claimed.data:
+            # A concurrent submit graded it first; return the grade that was kept
+            stored_response = await _execute(
+                supabase.table("language_attempts")
+                .select("score, verdict, feedback, corrections, missed_concepts")
+                .eq("id", str(attempt_id))
+                .single()
+            )
+            stored = stored_response.data
+            return LanguageAttemptGrade(
+                score=stored["score"],
+                verdict=stored["verdict"],
+                feedback=stored["feedback"],
+                corrections=stored.get("corrections"),
+                missed_concepts=stored.get("missed_concepts") or [],
             )
 
+        background_tasks.add_task(
+            _persist_attempt_followups,
+            supabase,
+            attempt,
+            grading_result.score,
+        )
+
         return LanguageAttemptGrade(
             score=grading_result.score,
             verdict=grading_result.verdict,
@@ -549,39 +522,18 @@ async def get_attempt(
 ):
     """Get a specific language attempt."""
     try:
-        response = (
+        response = await _execute(
             supabase.table("language_attempts")
-            .select("*")
+            .select(_ATTEMPT_COLUMNS)
             .eq("id", str(attempt_id))
             .single()
-            .execute()
         )
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Attempt not found")
 
         attempt = response.data
-        return LanguageAttempt(
-            id=attempt["id"],
-            user_id=attempt["user_id"],
-            track_id=attempt.get("track_id"),
-            topic=attempt["topic"],
-            exercise_type=attempt["exercise_type"],
-            question_text=attempt["question_text"],
-            expected_answer=attempt.get("expected_answer"),
-            question_focus_area=attempt.get("question_focus_area"),
-            question_key_concepts=attempt.get("question_key_concepts") or [],
-            response_text=attempt.get("response_text"),
-            word_count=attempt.get("word_count") or 0,
-            score=attempt.get("score"),
-            verdict=attempt.get("verdict"),
-            feedback=attempt.get("feedback"),
-            corrections=attempt.get("corrections"),
-            missed_concepts=attempt.get("missed_concepts") or [],
-            status=attempt["status"],
-            created_at=attempt["created_at"],
-            graded_at=attempt.get("graded_at"),
-        )
+        return LanguageAttempt.model_validate(_non_null(attempt))
     except HTTPException:
         raise
     except Exception as e:
@@ -593,41 +545,45 @@ async def get_attempt_history(
     user_id: UUID,
     limit: int = 20,
     offset: int = 0,
-    supabase: Annotated[Client, Depends(get_supabase)] = None,
+    postgrest: Annotated[httpx.AsyncClient, Depends(get_postgrest)] = None,
 ):
-    """Get user's language attempt history."""
+    """Get user's language attempt history.
+
+    ``has_more`` comes from fetching one row past the page; ``total`` uses
+    PostgREST's estimated count, which is exact for small result sets and
+    falls back to the planner estimate instead of a full COUNT(*).
+    """
     try:
-        response = (
-            supabase.table("language_attempts")
-            .select("*, language_tracks(name)", count="exact")
-            .eq("user_id", str(user_id))
-            .order("created_at", desc=True)
-            .range(offset, offset + limit - 1)
-            .execute()
+        resp = await postgrest.get(
+            "/language_attempts",
+            params={
+                "select": _ATTEMPT_HISTORY_SELECT,
+                "user_id": f"eq.{user_id}",
+                "order": "created_at.desc",
+                "offset": offset,
+                "limit": limit + 1,
+            },
+            headers={"Prefer": "count=estimated"},
+        )
+        resp.raise_for_status()
+
+        rows = resp.json()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        total = max(
+            parse_content_range_total(resp.headers.get("content-range")),
+            offset + len(rows) + has_more,
         )
 
-        total = response.count or 0
-        attempts = []
-
-        for a in (response.data or []):
+        for a in rows:
             track = a.get("language_tracks")
-            attempts.append(LanguageAttemptHistoryItem(
-                id=a["id"],
-                topic=a["topic"],
-                exercise_type=a["exercise_type"],
-                question_text=a["question_text"],
-                score=a.get("score"),
-                verdict=a.get("verdict"),
-                status=a["status"],
-                created_at=a["created_at"],
-                graded_at=a.get("graded_at"),
-                track_name=track.get("name") if track else None,
-            ))
+            a["track_name"] = track.get("name") if track else None
+        attempts = LANGUAGE_ATTEMPT_HISTORY_ADAPTER.validate_python(rows)
 
         return LanguageAttemptHistoryResponse(
             attempts=attempts,
             total=total,
-            has_more=offset + limit < total,
+            has_more=has_more,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get attempt history: {str(e)}")
@@ -644,12 +600,12 @@ async def get_due_reviews(
 ):
     """Get language topics due for review."""
     try:
-        response = supabase.rpc(
+        response = await _execute(supabase.rpc(
             "get_due_language_reviews",
             {"p_user_id": str(user_id), "p_limit": limit}
-        ).execute()
+        ))
 
-        return [LanguageReviewItem(**r) for r in response.data] if response.data else []
+        return LANGUAGE_REVIEW_ITEMS_ADAPTER.validate_python(response.data) if response.data else []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get reviews: {str(e)}")
 
@@ -662,22 +618,23 @@ async def complete_review(
 ):
     """Mark a language review as complete (pass/fail)."""
     try:
-        supabase.rpc(
+        await _execute(supabase.rpc(
             "complete_language_review",
             {"p_review_id": str(review_id), "p_success": request.success}
-        ).execute()
+        ))
 
-        updated = (
+        updated = await _execute(
             supabase.table("language_review_queue")
-            .select("*")
+            .select("user_id, next_review, interval_days")
             .eq("id", str(review_id))
             .single()
-            .execute()
         )
 
         if not updated.data:
             raise HTTPException(status_code=404, detail="Review not found")
 
+        _invalidate_lang_dashboard(updated.data["user_id"])
+
         return CompleteReviewResponse(
             id=review_id,
             next_review=updated.data["next_review"],
@@ -697,141 +654,158 @@ async def get_dashboard_summary(
     user_id: UUID,
     supabase: Annotated[Client, Depends(get_supabase)] = None,
 ):
-    """Get language learning summary for dashboard display."""
+    """Get language learning summary for dashboard display.
+
+    Concurrent misses for the same user share one rebuild instead of each
+    re-running the dashboard queries.
+    """
     cache_key = str(user_id)
     cached = _lang_dashboard_cache.get(cache_key)
     if cached and cached[0] > time.monotonic():
         return cached[1]
 
+    pending = _lang_dashboard_inflight.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_build_dashboard_summary(supabase, cache_key))
+        _lang_dashboard_inflight[cache_key] = pending
+        pending.add_done_callback(functools.partial(_finish_lang_dashboard, cache_key))
     try:
-        # Get user settings
-        settings_response = (
+        # Shielded so one cancelled caller doesn't cancel the rebuild for the others
+        return await asyncio.shield(pending)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get dashboard summary: {str(e)}")
+
+
+async def _build_dashboard_summary(supabase: Client, user_id_str: str) -> LanguageDashboardSummary:
+    """Run the dashboard queries for one user."""
+    # The settings, reviews and attempt stats reads are independent
+    def _q_settings():
+        return (
             supabase.table("user_language_settings")
-            .select("*")
-            .eq("user_id", str(user_id))
+            .select("active_track_id")
+            .eq("user_id", user_id_str)
             .limit(1)
             .execute()
         )
 
-        has_active_track = False
-        active_track = None
-        next_topic = None
-        book_total_chapters = 0
-        book_completed_chapters = 0
-
-        if settings_response.data and settings_response.data[0].get("active_track_id"):
-            has_active_track = True
-            active_track_id = settings_response.data[0]["active_track_id"]
-
-            # Get active track details
-            track_response = (
-                supabase.table("language_tracks")
-                .select("id, name, description, language, level, total_topics, topics")
-                .eq("id", active_track_id)
-                .single()
-                .execute()
+    def _q_reviews():
+        return supabase.rpc(
+            "get_due_language_reviews",
+            {"p_user_id": user_id_str, "p_limit": 5}
+        ).execute()
+
+    def _q_stats():
+        # Weekly exercise count and latest graded score in one query
+        return supabase.rpc(
+            "get_language_user_stats",
+            {"p_user_id": user_id_str}
+        ).execute()
+
+    settings_response, reviews_response, stats_response = await asyncio.gather(
+        asyncio.to_thread(_q_settings),
+        asyncio.to_thread(_q_reviews),
+        asyncio.to_thread(_q_stats),
+    )
+
+    has_active_track = False
+    active_track = None
+    next_topic = None
+    book_total_chapters = 0
+    book_completed_chapters = 0
+
+    if settings_response.data and settings_response.data[0].get("active_track_id"):
+        has_active_track = True
+        active_track_id = settings_response.data[0]["active_track_id"]
+
+        # The track summary and next topic are resolved server-side, so the
+        # topics array never leaves Postgres
+        track_response = await _execute(supabase.rpc(
+            "get_next_topic",
+            {"p_user_id": user_id_str, "p_track_id": active_track_id},
+        ))
+
+        if track_response.data:
+            track_data = track_response.data
+            active_track = LanguageTrackSummary(
+                id=track_data["id"],
+                name=track_data["name"],
+                description=track_data.get("description"),
+                language=track_data["language"],
+                level=track_data["level"],
+                total_topics=track_data.get("total_topics") or 0,
             )
 
-            if track_response.data:
-                track_data = track_response.data
-                active_track = LanguageTrackSummary(
-                    id=track_data["id"],
-                    name=track_data["name"],
-                    description=track_data.get("description"),
+            # Book progress stats
+            book_total_chapters = track_data.get("topic_count") or 0
+            book_completed_chapters = track_data.get("completed_count") or 0
+
+            topic = track_data.get("next_topic")
+            if topic:
+                next_topic = LanguageNextTopicInfo(
+                    track_id=UUID(track_data["id"]),
+                    track_name=track_data["name"],
                     language=track_data["language"],
                     level=track_data["level"],
-                    total_topics=track_data.get("total_topics", 0),
+                    topic_name=topic.get("name", ""),
+                    topic_order=topic.get("order", 0),
+                    topic_difficulty=topic.get("difficulty", "medium"),
+                    key_concepts=topic.get("key_concepts", []),
+                    topics_completed=book_completed_chapters,
+                    total_topics=track_data.get("total_topics") or 0,
                 )
 
-                # Get user's progress to find next topic
-                progress_response = (
-                    supabase.table("language_track_progress")
-                    .select("completed_topics")
-                    .eq("user_id", str(user_id))
-                    .eq("track_id", active_track_id)
-                    .limit(1)
-                    .execute()
-                )
+    reviews_due = []
+    if reviews_response.data:
+        reviews_due = LANGUAGE_REVIEW_ITEMS_ADAPTER.validate_python(reviews_response.data)
+
+    stats = stats_response.data or {}
+    exercises_this_week = stats.get("exercises_this_week") or 0
+    recent_score = stats.get("recent_score")
+
+    book_pct = (book_completed_chapters / book_total_chapters * 100) if book_total_chapters > 0 else 0.0
+
+    response = LanguageDashboardSummary(
+        has_active_track=has_active_track,
+        active_track=active_track,
+        next_topic=next_topic,
+        reviews_due_count=len(reviews_due),
+        reviews_due=reviews_due,
+        recent_score=recent_score,
+        exercises_this_week=exercises_this_week,
+        book_total_chapters=book_total_chapters,
+        book_completed_chapters=book_completed_chapters,
+        book_completion_percentage=round(book_pct, 1),
+    )
+    return response
 
-                completed_topics = []
-                if progress_response.data:
-                    completed_topics = progress_response.data[0].get("completed_topics", [])
-
-                # Book progress stats
-                topics = track_data.get("topics", [])
-                book_total_chapters = len(topics)
-                book_completed_chapters = len(completed_topics)
-
-                # Find next uncompleted topic
-                for topic in sorted(topics, key=lambda t: t.get("order", 0)):
-                    if topic.get("name") not in completed_topics:
-                        next_topic = LanguageNextTopicInfo(
-                            track_id=UUID(track_data["id"]),
-                            track_name=track_data["name"],
-                            language=track_data["language"],
-                            level=track_data["level"],
-                            topic_name=topic.get("name", ""),
-                            topic_order=topic.get("order", 0),
-                            topic_difficulty=topic.get("difficulty", "medium"),
-                            key_concepts=topic.get("key_concepts", []),
-                            topics_completed=len(completed_topics),
-                            total_topics=track_data.get("total_topics", 0),
-                        )
-                        break
-
-        # Get reviews due
-        reviews_response = supabase.rpc(
-            "get_due_language_reviews",
-            {"p_user_id": str(user_id), "p_limit": 5}
-        ).execute()
 
-        reviews_due = []
-        if reviews_response.data:
-            reviews_due = [LanguageReviewItem(**r) for r in reviews_response.data]
+def _finish_lang_dashboard(user_id: str, task: asyncio.Future) -> None:
+    """Cache a finished rebuild, unless the dashboard was invalidated while it ran.
 
-        # Get exercises this week
-        week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-        exercises_response = (
-            supabase.table("language_attempts")
-            .select("id", count="exact")
-            .eq("user_id", str(user_id))
-            .gte("created_at", week_ago)
-            .execute()
-        )
-        exercises_this_week = exercises_response.count or 0
+    Invalidation drops the in-flight entry, so a rebuild that may have read
+    pre-write data finds itself replaced (or gone) and is not cached.
+    """
+    if _lang_dashboard_inflight.get(user_id) is not task:
+        return
+    del _lang_dashboard_inflight[user_id]
+    if not task.cancelled() and task.exception() is None:
+        _store_lang_dashboard(user_id, task.result())
 
-        # Get most recent score
-        recent_score = None
-        recent_attempt_response = (
-            supabase.table("language_attempts")
-            .select("score")
-            .eq("user_id", str(user_id))
-            .eq("status", "graded")
-            .order("graded_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-        if recent_attempt_response.data:
-            recent_score = recent_attempt_response.data[0].get("score")
 
-        book_pct = (book_completed_chapters / book_total_chapters * 100) if book_total_chapters > 0 else 0.0
+def _store_lang_dashboard(user_id: str, response: LanguageDashboardSummary) -> None:
+    """Cache a dashboard, purging expired entries and capping the cache size.
 
-        response = LanguageDashboardSummary(
-            has_active_track=has_active_track,
-            active_track=active_track,
-            next_topic=next_topic,
-            reviews_due_count=len(reviews_due),
-            reviews_due=reviews_due,
-            recent_score=recent_score,
-            exercises_this_week=exercises_this_week,
-            book_total_chapters=book_total_chapters,
-            book_completed_chapters=book_completed_chapters,
-            book_completion_percentage=round(book_pct, 1),
-        )
-        _lang_dashboard_cache[cache_key] = (time.monotonic() + _LANG_DASHBOARD_CACHE_TTL, response)
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get dashboard summary: {str(e)}")
+    Every entry shares one TTL, so insertion order is expiry order: expired and
+    overflow entries are always at the front of the dict.
+    """
+    now = time.monotonic()
+    _lang_dashboard_cache.pop(user_id, None)
+    while _lang_dashboard_cache and (
+        len(_lang_dashboard_cache) >= _LANG_DASHBOARD_CACHE_MAX
+        or next(iter(_lang_dashboard_cache.values()))[0] <= now
+    ):
+        del _lang_dashboard_cache[next(iter(_lang_dashboard_cache))]
+    _lang_dashboard_cache[user_id] = (now + _LANG_DASHBOARD_CACHE_TTL, response)
 
 
 @router.put("/language/{user_id}/active-track")
@@ -843,14 +817,8 @@ async def set_active_track(
     """Set user's active language track."""
     try:
         if request.track_id:
-            track_response = (
-                supabase.table("language_tracks")
-                .select("id, name")
-                .eq("id", str(request.track_id))
-                .single()
-                .execute()
-            )
-            if not track_response.data:
+            track_data = await _load_track(supabase, str(request.track_id))
+            if not track_data:
                 raise HTTPException(status_code=404, detail="Track not found")
 
         settings_data = {
@@ -859,13 +827,14 @@ async def set_active_track(
             "updated_at": datetime.utcnow().isoformat(),
         }
 
-        supabase.table("user_language_settings").upsert(
+        await _execute(supabase.table("user_language_settings").upsert(
             settings_data, on_conflict="user_id"
-        ).execute()
+        ))
+        _invalidate_lang_dashboard(user_id)
 
         track_name = None
-        if request.track_id and track_response.data:
-            track_name = track_response.data.get("name")
+        if request.track_id and track_data:
+            track_name = track_data.get("name")
 
         return {
             "success": True,
@@ -909,13 +878,12 @@ async def get_daily_exercises(
 
     try:
         # Check if exercises already exist for today
-        existing = (
+        existing = await _execute(
             supabase.table("language_daily_exercises")
             .select("*")
             .eq("user_id", str(user_id))
             .eq("generated_date", today)
             .order("sort_order")
-            .execute()
         )
 
         if existing.data:
@@ -943,12 +911,11 @@ async def submit_daily_exercise(
     """Submit an answer for a daily exercise and get inline grading."""
     try:
         # Get the exercise
-        exercise_response = (
+        exercise_response = await _execute(
             supabase.table("language_daily_exercises")
-            .select("*, language_tracks(*)")
+            .select("*, language_tracks(language, level)")
             .eq("id", str(exercise_id))
             .single()
-            .execute()
         )
 
         if not exercise_response.data:
@@ -998,9 +965,9 @@ async def submit_daily_exercise(
             "completed_at": datetime.utcnow().isoformat(),
         }
 
-        supabase.table("language_daily_exercises").update(update_data).eq(
+        await _execute(supabase.table("language_daily_exercises").update(update_data).eq(
             "id", str(exercise_id)
-        ).execute()
+        ))
 
         # Also create a language_attempts record for history tracking
         attempt_data = {
@@ -1023,14 +990,14 @@ async def submit_daily_exercise(
             "graded_at": datetime.utcnow().isoformat(),
         }
         try:
-            supabase.table("language_attempts").insert(attempt_data).execute()
+            await _execute(supabase.table("language_attempts").insert(attempt_data))
         except Exception:
             pass  # Attempt logging is best-effort
 
         # Add to review queue if score < 7
         if grading_result.score < 7:
             try:
-                supabase.table("language_review_queue").upsert(
+                await _execute(supabase.table("language_review_queue").upsert(
                     {
                         "user_id": exercise["user_id"],
                         "track_id": exercise.get("track_id"),
@@ -1040,14 +1007,15 @@ async def submit_daily_exercise(
                         "interval_days": 1,
                     },
                     on_conflict="user_id,topic",
-                ).execute()
+                ))
             except Exception:
                 pass
 
         # Update track progress
         track_id = exercise.get("track_id")
         if track_id:
-            _update_language_track_progress(
+            await asyncio.to_thread(
+                _update_language_track_progress,
                 supabase, exercise["user_id"], track_id,
                 exercise["topic"], grading_result.score,
             )
@@ -1082,18 +1050,17 @@ async def regenerate_daily_exercises(
 
     try:
         # Delete pending exercises for today
-        supabase.table("language_daily_exercises").delete().eq(
+        await _execute(supabase.table("language_daily_exercises").delete().eq(
             "user_id", str(user_id)
-        ).eq("generated_date", today).eq("status", "pending").execute()
+        ).eq("generated_date", today).eq("status", "pending"))
 
         # Get remaining completed exercises
-        remaining = (
+        remaining = await _execute(
             supabase.table("language_daily_exercises")
             .select("*")
             .eq("user_id", str(user_id))
             .eq("generated_date", today)
             .order("sort_order")
-            .execute()
         )
 
         completed_exercises = remaining.data or []
@@ -1138,12 +1105,11 @@ async def _generate_daily_batch(
     start_order = len(existing_exercises)
 
     # 1. Get user's active track
-    settings_response = (
+    settings_response = await _execute(
         supabase.table("user_language_settings")
         .select("active_track_id")
         .eq("user_id", str(user_id))
         .limit(1)
-        .execute()
     )
 
     if not settings_response.data or not settings_response.data[0].get("active_track_id"):
@@ -1152,30 +1118,22 @@ async def _generate_daily_batch(
     active_track_id = settings_response.data[0]["active_track_id"]
 
     # 2. Get track details
-    track_response = (
-        supabase.table("language_tracks")
-        .select("*")
-        .eq("id", active_track_id)
-        .single()
-        .execute()
-    )
+    track_data = await _load_track(supabase, active_track_id)
 
-    if not track_response.data:
+    if not track_data:
         raise HTTPException(status_code=404, detail="Active track not found")
 
-    track_data = track_response.data
     language = track_data["language"]
     level = track_data["level"]
     topics = sorted(track_data.get("topics", []), key=lambda t: t.get("order", 0))
 
     # 3. Get user's track progress (completed topics)
-    progress_response = (
+    progress_response = await _execute(
         supabase.table("language_track_progress")
         .select("completed_topics")
         .eq("user_id", str(user_id))
         .eq("track_id", active_track_id)
         .limit(1)
-        .execute()
     )
 
     completed_topics = set()
@@ -1184,11 +1142,11 @@ async def _generate_daily_batch(
 
     # 4. Get due reviews from language_review_queue (limit 3)
     review_limit = min(3, target_count)
-    reviews_response = (
+    reviews_response = await _execute(
         supabase.rpc(
             "get_due_language_reviews",
             {"p_user_id": str(user_id), "p_limit": review_limit},
-        ).execute()
+        )
     )
 
     review_topics = []
@@ -1249,19 +1207,7 @@ async def _generate_daily_batch(
     # 6. Get user's weak areas from recent attempts
     user_weak_areas = []
     try:
-        recent_attempts = (
-            supabase.table("language_attempts")
-            .select("missed_concepts")
-            .eq("user_id", str(user_id))
-            .eq("status", "graded")
-            .order("graded_at", desc=True)
-            .limit(5)
-            .execute()
-        )
-        if recent_attempts.data:
-            for a in recent_attempts.data:
-                user_weak_areas.extend(a.get("missed_concepts") or [])
-            user_weak_areas = list(set(user_weak_areas))[:5]
+        user_weak_areas = await asyncio.to_thread(_fetch_recent_weak_areas, supabase, str(user_id))
     except Exception:
         pass
 
@@ -1271,12 +1217,11 @@ async def _generate_daily_batch(
 
     if all_topic_names:
         try:
-            book_response = (
+            book_response = await _execute(
                 supabase.table("book_content")
                 .select("chapter_title, summary, key_concepts, case_studies")
                 .eq("language_track_id", active_track_id)
                 .in_("chapter_title", all_topic_names)
-                .execute()
             )
             if book_response.data:
                 for bc in book_response.data:
@@ -1327,16 +1272,15 @@ async def _generate_daily_batch(
         })
 
     if rows:
-        supabase.table("language_daily_exercises").insert(rows).execute()
+        await _execute(supabase.table("language_daily_exercises").insert(rows))
 
     # 10. Fetch all exercises for today (including previously completed) and return
-    all_exercises_response = (
+    all_exercises_response = await _execute(
         supabase.table("language_daily_exercises")
         .select("*")
         .eq("user_id", str(user_id))
         .eq("generated_date", today)
         .order("sort_order")
-        .execute()
     )
 
     return _build_batch_response(all_exercises_response.data or [], today)
@@ -1412,6 +1356,52 @@ def _build_batch_response(exercises_data: list[dict], today: str) -> DailyExerci
 # ============ Helpers ============
 
 
+def _non_null(row: dict) -> dict:
+    """Drop NULL columns so model defaults (empty lists, 0) apply on validation."""
+    return {k: v for k, v in row.items() if v is not None}
+
+
+async def _execute(query):
+    """Run a blocking supabase-py query on a worker thread so the event loop stays free."""
+    return await asyncio.to_thread(query.execute)
+
+
+async def _load_track(supabase: Client, track_id: str) -> Optional[dict]:
+    """Read a language track row through a short TTL cache.
+
+    The returned dict is shared between requests and must not be mutated.
+    """
+    cached = _track_cache.get(track_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    response = await _execute(
+        supabase.table("language_tracks")
+        .select(_TRACK_COLUMNS)
+        .eq("id", track_id)
+        .single()
+    )
+    if response.data and _TRACK_FIELDS <= response.data.keys():
+        _store_track(track_id, response.data)
+    return response.data
+
+
+def _store_track(track_id: str, track_data: dict) -> None:
+    """Cache a track row, purging expired entries and capping the cache size.
+
+    Every entry shares one TTL, so insertion order is expiry order: expired and
+    overflow entries are always at the front of the dict.
+    """
+    now = time.monotonic()
+    _track_cache.pop(track_id, None)
+    while _track_cache and (
+        len(_track_cache) >= _TRACK_CACHE_MAX
+        or next(iter(_track_cache.values()))[0] <= now
+    ):
+        del _track_cache[next(iter(_track_cache))]
+    _track_cache[track_id] = (now + _TRACK_CACHE_TTL, track_data)
+
+
 def _update_language_track_progress(
     supabase: Client,
     user_id: str,
@@ -1419,42 +1409,66 @@ def _update_language_track_progress(
     topic: str,
     score: float,
 ):
-    """Update user's language track progress after completing an exercise."""
+    """Update user's language track progress after completing an exercise.
+
+    The read-modify-write happens inside one upsert RPC, so concurrent
+    submissions for the same track can't lose each other's updates.
+    """
     try:
-        progress_response = (
-            supabase.table("language_track_progress")
-            .select("*")
-            .eq("user_id", str(user_id))
-            .eq("track_id", str(track_id))
-            .limit(1)
-            .execute()
-        )
+        supabase.rpc("upsert_language_track_progress", {
+            "p_user_id": str(user_id),
+            "p_track_id": str(track_id),
+            "p_topic": topic,
+            "p_score": score,
+        }).execute()
+    except Exception:
+        logger.exception("Failed to update language track progress for user %s, track %s", user_id, track_id)
+    _invalidate_lang_dashboard(user_id)
 
-        if progress_response.data:
-            progress = progress_response.data[0]
-            completed = set(progress.get("completed_topics", []))
-
-            # Only mark topic completed if score >= 7 (proficiency threshold)
-            if score >= 7:
-                completed.add(topic)
-
-            sessions = progress.get("sessions_completed", 0) + 1
-            current_avg = progress.get("average_score", 0.0)
-            new_avg = ((current_avg * (sessions - 1)) + score) / sessions
-
-            supabase.table("language_track_progress").update({
-                "completed_topics": list(completed),
-                "sessions_completed": sessions,
-                "average_score": new_avg,
-                "last_activity_at": datetime.utcnow().isoformat(),
-            }).eq("id", progress["id"]).execute()
-        else:
-            supabase.table("language_track_progress").insert({
+
+async def _persist_attempt_followups(
+    supabase: Client,
+    attempt: dict,
+    score: float,
+):
+    """Write a graded attempt's review queue entry and track progress concurrently."""
+    user_id = attempt["user_id"]
+    track_id = attempt.get("track_id")
+
+    def _w_review():
+        try:
+            supabase.table("language_review_queue").upsert({
                 "user_id": str(user_id),
-                "track_id": str(track_id),
-                "completed_topics": [topic] if score >= 7 else [],
-                "sessions_completed": 1,
-                "average_score": score,
-            }).execute()
-    except Exception as e:
-        print(f"Failed to update language track progress: {e}")
+                "track_id": str(track_id) if track_id else None,
+                "topic": attempt["topic"],
+                "reason": f"Weak area from {attempt['exercise_type']} exercise on {attempt['topic']}",
+                "priority": 1,
+                "interval_days": 1,
+            }, on_conflict="user_id,topic").execute()
+        except Exception:
+            logger.exception("Failed to queue language review for user %s, topic %s", user_id, attempt["topic"])
+
+    try:
+        writes = []
+        # Add to review queue if score < 7
+        if score < 7:
+            writes.append(asyncio.to_thread(_w_review))
+        if track_id:
+            writes.append(asyncio.to_thread(
+                _update_language_track_progress, supabase, user_id, track_id, attempt["topic"], score
+            ))
+        await asyncio.gather(*writes)
+    finally:
+        _invalidate_lang_dashboard(user_id)
+
+
+def _fetch_recent_weak_areas(supabase: Client, user_id: str) -> list[str]:
+    """Distinct missed concepts from the user's last 5 graded attempts, newest first (max 5)."""
+    response = supabase.rpc("get_recent_weak_areas", {"p_user_id": user_id}).execute()
+    return response.data or []
+
+
+def _invalidate_lang_dashboard(user_id) -> None:
+    """Drop a user's cached dashboard, and any rebuild in flight, after a write that changes it."""
+    _lang_dashboard_cache.pop(str(user_id), None)
+    _lang_dashboard_inflight.pop(str(user_id), None)
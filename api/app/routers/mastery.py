@@ -1,23 +1,41 @@
 """Mastery endpoints - DSA domain readiness assessment."""
 
+import logging
+import time
 from datetime import datetime
 from typing import Annotated
 from uuid import UUID
 
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
+from postgrest.exceptions import APIError
 from supabase import Client
 
 from app.db.supabase import get_supabase
 from app.models.schemas import (
+    SUBMISSION_SUMMARY_COLUMNS,
     DomainDetailResponse,
     DomainScore,
     MasteryResponse,
     PathProblem,
-    Submission,
+    SubmissionSummary,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Failures from a Supabase round trip, logged with their duration so slow or
+# failing queries show up; anything else (an unexpected row shape) is logged
+# with a traceback. Either way the handlers degrade to a JSON 500 / fallback.
+_DB_ERRORS = (APIError, httpx.HTTPError, TimeoutError)
+
+# NeetCode 150 learning path, whose categories back every domain's recommended path
+_NEETCODE_150_PATH_ID = "11111111-1111-1111-1111-111111111150"
+# Path categories are effectively static: {path_id: (expiry_timestamp, categories)}
+_path_categories_cache: dict[str, tuple[float, list[dict]]] = {}
+_PATH_CATEGORIES_CACHE_TTL = 3600  # 1 hour
+
 # Google DSA Domain mappings
 # Maps LeetCode tags to our 16 Google-readiness domains
 DOMAIN_MAPPINGS = {
@@ -42,6 +60,14 @@ DOMAIN_MAPPINGS = {
 # All domains (used to ensure we show all 16 even if unpracticed)
 ALL_DOMAINS = list(DOMAIN_MAPPINGS.keys())
 
+# Reverse lookup from LeetCode tag to domain (first mapping wins)
+TAG_TO_DOMAIN = {
+    tag: domain
+    for domain, tags in reversed(DOMAIN_MAPPINGS.items())
+    for tag in tags
+}
+_MAPPED_TAGS = list(TAG_TO_DOMAIN)
+
 
 def get_status(score: float) -> str:
     """Convert score to status label."""
@@ -57,13 +83,10 @@ def get_status(score: float) -> str:
 
 def map_tag_to_domain(tag: str) -> str | None:
     """Map a LeetCode tag to our domain."""
-    for domain, tags in DOMAIN_MAPPINGS.items():
-        if tag in tags:
-            return domain
-    return None
+    return TAG_TO_DOMAIN.get(tag)
 
 
-@router.get("/mastery/{user_id}", response_model=MasteryResponse)
+@router.get("/mastery/{user_id}", response_model=MasteryResponse, response_model_exclude_none=True)
 async def get_mastery(
     user_id: UUID,
     supabase: Annotated[Client, Depends(get_supabase)] = None,
@@ -74,11 +97,12 @@ async def get_mastery(
     Returns readiness score and domain breakdown for Google-level preparation.
     """
     try:
-        # Get all skill scores for user
+        # Get the user's skill scores for tags that map to a domain
         skills_response = (
             supabase.table("skill_scores")
             .select("tag, score, total_attempts, success_rate")
             .eq("user_id", str(user_id))
+            .in_("tag", _MAPPED_TAGS)
             .execute()
         )
 
@@ -88,7 +112,7 @@ async def get_mastery(
         if skills_response.data:
             for skill in skills_response.data:
                 tag = skill["tag"]
-                domain = map_tag_to_domain(tag)
+                domain = TAG_TO_DOMAIN.get(tag)
                 if domain:
                     domain_scores[domain]["scores"].append(skill["score"])
                     domain_scores[domain]["attempts"] += skill.get("total_attempts", 0)
@@ -155,11 +179,12 @@ async def get_mastery(
             strong_areas=strong_areas,
             generated_at=datetime.utcnow(),
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get mastery data: {str(e)}")
+    except Exception:
+        logger.exception("Mastery query failed for user %s", user_id)
+        raise HTTPException(status_code=500, detail="Failed to get mastery data")
 
 
-@router.get("/mastery/{user_id}/{domain_name}", response_model=DomainDetailResponse)
+@router.get("/mastery/{user_id}/{domain_name}", response_model=DomainDetailResponse, response_model_exclude_none=True)
 async def get_domain_detail(
     user_id: UUID,
     domain_name: str,
@@ -183,17 +208,18 @@ async def get_domain_detail(
         total_attempts = 0
         total_solved = 0
 
-        for tag in relevant_tags:
-            skill_response = (
-                supabase.table("skill_scores")
-                .select("score, total_attempts, success_rate")
-                .eq("user_id", str(user_id))
-                .eq("tag", tag)
-                .execute()
-            )
+        skills_response = (
+            supabase.table("skill_scores")
+            .select("tag, score, total_attempts, success_rate")
+            .eq("user_id", str(user_id))
+            .in_("tag", relevant_tags)
+            .execute()
+        )
+        skills_by_tag = {row["tag"]: row for row in skills_response.data or []}
 
-            if skill_response.data:
-                skill = skill_response.data[0]
+        for tag in relevant_tags:
+            skill = skills_by_tag.get(tag)
+            if skill:
                 score = skill["score"]
                 attempts = skill.get("total_attempts", 0)
                 solved = int(skill.get("success_rate", 0) * attempts)
@@ -236,23 +262,16 @@ async def get_domain_detail(
         )
 
         # Get recent submissions for this domain
-        recent_submissions = []
-        for tag in relevant_tags[:3]:  # Limit to avoid too many queries
-            subs_response = (
-                supabase.table("submissions")
-                .select("*")
-                .eq("user_id", str(user_id))
-                .contains("tags", [tag])
-                .order("submitted_at", desc=True)
-                .limit(3)
-                .execute()
-            )
-            if subs_response.data:
-                for s in subs_response.data:
-                    if not any(r.id == s["id"] for r in recent_submissions):
-                        recent_submissions.append(Submission(**s))
-
-        recent_submissions = recent_submissions[:5]  # Limit total
+        subs_response = (
+            supabase.table("submissions")
+            .select(SUBMISSION_SUMMARY_COLUMNS)
+            .eq("user_id", str(user_id))
+            .overlaps("tags", relevant_tags[:3])
+            .order("submitted_at", desc=True)
+            .limit(5)
+            .execute()
+        )
+        recent_submissions = [SubmissionSummary.from_row(s) for s in subs_response.data or []]
 
         # Generate failure analysis
         failure_analysis = await _analyze_failures(supabase, user_id, relevant_tags)
@@ -268,8 +287,9 @@ async def get_domain_detail(
         )
     except HTTPException:
         raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get domain detail: {str(e)}")
+    except Exception:
+        logger.exception("Domain detail query failed for user %s, domain %s", user_id, domain_name)
+        raise HTTPException(status_code=500, detail="Failed to get domain detail")
 
 
 async def _analyze_failures(
@@ -278,39 +298,20 @@ async def _analyze_failures(
     tags: list[str],
 ) -> str:
     """Analyze failure patterns for given tags."""
+    started = time.perf_counter()
     try:
-        # Get recent failures
-        failures = []
-        for tag in tags[:3]:
-            response = (
-                supabase.table("submissions")
-                .select("status, difficulty")
-                .eq("user_id", str(user_id))
-                .neq("status", "Accepted")
-                .contains("tags", [tag])
-                .order("submitted_at", desc=True)
-                .limit(5)
-                .execute()
-            )
-            if response.data:
-                failures.extend(response.data)
-
-        if not failures:
+        # Most common status / difficulty across recent failures, counted in SQL
+        response = supabase.rpc(
+            "analyze_user_failures",
+            {"p_user_id": str(user_id), "p_tags": tags[:3]},
+        ).execute()
+        row = response.data[0] if response.data else {}
+        most_common_error = row.get("most_common_error")
+        most_failed_diff = row.get("most_failed_diff")
+
+        if not most_common_error:
             return "No failure data yet. Keep practicing to get personalized analysis."
 
-        # Analyze failure types
-        status_counts = {}
-        difficulty_counts = {}
-        for f in failures:
-            status = f.get("status", "Unknown")
-            diff = f.get("difficulty", "Unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
-            difficulty_counts[diff] = difficulty_counts.get(diff, 0) + 1
-
-        # Generate analysis
-        most_common_error = max(status_counts, key=status_counts.get)
-        most_failed_diff = max(difficulty_counts, key=difficulty_counts.get)
-
         if most_common_error == "Time Limit Exceeded":
             return f"Most failures are TLE on {most_failed_diff} problems. Focus on optimizing time complexity and recognizing when O(n^2) won't work."
         elif most_common_error == "Wrong Answer":
@@ -320,7 +321,15 @@ async def _analyze_failures(
         else:
             return f"Common failure: {most_common_error}. Practice more {most_failed_diff} problems to build confidence."
 
+    except _DB_ERRORS:
+        logger.warning(
+            "analyze_user_failures failed after %.0f ms",
+            (time.perf_counter() - started) * 1000,
+            exc_info=True,
+        )
+        return "Unable to analyze failures at this time."
     except Exception:
+        logger.exception("Failure analysis got an unexpected result")
         return "Unable to analyze failures at this time."
 
 
@@ -330,20 +339,9 @@ async def _get_domain_path(
     limit: int = 5,
 ) -> list[PathProblem]:
     """Get recommended problems for a domain from NeetCode 150."""
+    started = time.perf_counter()
     try:
-        # Get NeetCode 150 path
-        path_response = (
-            supabase.table("learning_paths")
-            .select("categories")
-            .eq("id", "11111111-1111-1111-1111-111111111150")
-            .single()
-            .execute()
-        )
-
-        if not path_response.data:
-            return []
-
-        categories = path_response.data.get("categories", [])
+        categories = _get_path_categories(supabase, _NEETCODE_150_PATH_ID)
 
         # Find matching category
         for cat in categories:
@@ -359,6 +357,32 @@ async def _get_domain_path(
                     for p in problems
                 ]
 
+        return []
+    except _DB_ERRORS:
+        logger.warning(
+            "NeetCode 150 path lookup failed after %.0f ms",
+            (time.perf_counter() - started) * 1000,
+            exc_info=True,
+        )
         return []
     except Exception:
+        logger.exception("NeetCode 150 path has an unexpected shape")
         return []
+
+
+def _get_path_categories(supabase: Client, path_id: str) -> list[dict]:
+    """Get a learning path's categories, cached for an hour."""
+    cached = _path_categories_cache.get(path_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    path_response = (
+        supabase.table("learning_paths")
+        .select("categories")
+        .eq("id", path_id)
+        .single()
+        .execute()
+    )
+    categories = (path_response.data or {}).get("categories") or []
+    _path_categories_cache[path_id] = (time.monotonic() + _PATH_CATEGORIES_CACHE_TTL, categories)
+    return categories
@@ -1,5 +1,7 @@
 """Mission Control API endpoints - Daily mission generation and tracking."""
 
+import asyncio
+import functools
 import time
 from datetime import datetime
 from typing import Annotated
@@ -16,7 +18,7 @@ from app.models.schemas import (
     Difficulty,
 )
 from app.services.mission_generator import MissionGenerator
-from app.services.gemini_gateway import GeminiGateway
+from app.services.gemini_gateway import get_gemini_gateway
 from app.utils import parse_iso_datetime
 
 router = APIRouter()
@@ -24,6 +26,9 @@ router = APIRouter()
 # In-memory TTL cache for missions: {user_id_str: (expiry_timestamp, response)}
 _mission_cache: dict[str, tuple[float, DailyMissionResponseV2]] = {}
 _MISSION_CACHE_TTL = 300  # 5 minutes
+_MISSION_CACHE_MAX = 10_000  # entries; bounds memory by active users, not all users ever seen
+# Generations in progress, so a burst of misses for one user makes one Gemini call
+_mission_inflight: dict[str, asyncio.Future] = {}
 
 
 def _parse_difficulty(diff: str | None) -> Difficulty | None:
@@ -94,18 +99,62 @@ async def get_daily_mission(
     if cached and cached[0] > time.monotonic():
         return cached[1]
 
+    pending = _mission_inflight.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_generate_mission(supabase, user_id))
+        _mission_inflight[cache_key] = pending
+        pending.add_done_callback(functools.partial(_finish_mission, cache_key))
     try:
-        gemini = GeminiGateway()
-        generator = MissionGenerator(supabase, gemini)
-
-        mission_data = await generator.generate_mission(user_id)
-        response = _build_mission_response(mission_data)
-        _mission_cache[cache_key] = (time.monotonic() + _MISSION_CACHE_TTL, response)
-        return response
+        # Shielded so one cancelled caller doesn't cancel the generation for the others
+        return await asyncio.shield(pending)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get mission: {str(e)}")
 
 
+async def _generate_mission(supabase: Client, user_id: UUID) -> DailyMissionResponseV2:
+    """Generate (or load) today's mission."""
+    gemini = get_gemini_gateway()
+    generator = MissionGenerator(supabase, gemini)
+
+    mission_data = await generator.generate_mission(user_id)
+    return _build_mission_response(mission_data)
+
+
+def _finish_mission(user_id: str, task: asyncio.Future) -> None:
+    """Cache a finished generation, unless the mission was invalidated while it ran.
+
+    Invalidation drops the in-flight entry, so a generation that may predate a
+    regenerate or reset finds itself replaced (or gone) and is not cached.
+    """
+    if _mission_inflight.get(user_id) is not task:
+        return
+    del _mission_inflight[user_id]
+    if not task.cancelled() and task.exception() is None:
+        _store_mission(user_id, task.result())
+
+
+def _invalidate_mission(user_id: str) -> None:
+    """Drop a user's cached mission and any generation in flight."""
+    _mission_cache.pop(user_id, None)
+    _mission_inflight.pop(user_id, None)
+
+
+def _store_mission(user_id: str, response: DailyMissionResponseV2) -> None:
+    """Cache a mission, purging expired entries and capping the cache size.
+
+    Every entry shares one TTL, so insertion order is expiry order: expired and
+    overflow entries are always at the front of the dict.
+    """
+    now = time.monotonic()
+    _mission_cache.pop(user_id, None)
+    while _mission_cache and (
+        len(_mission_cache) >= _MISSION_CACHE_MAX
+        or next(iter(_mission_cache.values()))[0] <= now
+    ):
+        del _mission_cache[next(iter(_mission_cache))]
+    _mission_cache[user_id] = (now + _MISSION_CACHE_TTL, response)
+
+
 @router.post("/mission/{user_id}/regenerate", response_model=DailyMissionResponseV2)
 async def regenerate_mission(
     user_id: UUID,
@@ -120,15 +169,15 @@ async def regenerate_mission(
         DailyMissionResponseV2 with new problems and reasoning
     """
     cache_key = str(user_id)
-    _mission_cache.pop(cache_key, None)
+    _invalidate_mission(cache_key)
 
     try:
-        gemini = GeminiGateway()
+        gemini = get_gemini_gateway()
         generator = MissionGenerator(supabase, gemini)
 
         mission_data = await generator.generate_mission(user_id, force_regenerate=True)
         response = _build_mission_response(mission_data)
-        _mission_cache[cache_key] = (time.monotonic() + _MISSION_CACHE_TTL, response)
+        _store_mission(cache_key, response)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to regenerate mission: {str(e)}")
@@ -144,7 +193,7 @@ async def reset_daily_mission(
 
     Useful when a mission is in a bad state.
     """
-    _mission_cache.pop(str(user_id), None)
+    _invalidate_mission(str(user_id))
 
     try:
         # Use RPC function to bypass RLS
@@ -184,7 +233,7 @@ async def generate_all_missions(
             raise HTTPException(status_code=401, detail="Invalid or missing cron secret")
 
     try:
-        gemini = GeminiGateway()
+        gemini = get_gemini_gateway()
         generator = MissionGenerator(supabase, gemini)
 
         results = await generator.generate_all_missions()
@@ -456,9 +456,10 @@ async def _generate_daily_batch(
             .execute()
         )
         if weak_response.data:
-            for r in weak_response.data:
-                weak_areas.extend(r.get("missed_concepts") or [])
-            weak_areas = list(set(weak_areas))[:5]
+            # Order-preserving dedup: most recently missed concepts first
+            weak_areas = list(dict.fromkeys(
+                c for r in weak_response.data for c in (r.get("missed_concepts") or [])
+            ))[:5]
     except Exception:
         pass
 
@@ -10,9 +10,13 @@ from supabase import Client
 from app.auth import AuthenticatedUser, get_current_user
 from app.db.supabase import get_supabase
 from app.models.schemas import (
+    SKILL_SCORE_LIST_ADAPTER,
+    SUBMISSION_SUMMARY_COLUMNS,
     ProgressTrend,
     SkillScore,
     Submission,
+    SubmissionStatus,
+    SubmissionSummary,
     UserProgress,
     UserStats,
 )
@@ -30,7 +34,7 @@ async def get_my_stats(
     return await get_user_stats(user_id, supabase)
 
 
-@router.get("/progress/{user_id}", response_model=UserProgress)
+@router.get("/progress/{user_id}", response_model=UserProgress, response_model_exclude_none=True)
 async def get_user_progress(
     user_id: UUID,
     days: int = Query(default=30, ge=1, le=365, description="Number of days for trend data"),
@@ -83,7 +87,7 @@ async def get_user_progress(
             .order("score", desc=False)
             .execute()
         )
-        skill_scores = [SkillScore(**s) for s in skill_response.data] if skill_response.data else []
+        skill_scores = SKILL_SCORE_LIST_ADAPTER.validate_python(skill_response.data) if skill_response.data else []
 
         # Get submission trends
         start_date = datetime.utcnow() - timedelta(days=days)
@@ -92,13 +96,13 @@ async def get_user_progress(
         # Get recent submissions
         recent_response = (
             supabase.table("submissions")
-            .select("*")
+            .select(SUBMISSION_SUMMARY_COLUMNS)
             .eq("user_id", str(user_id))
             .order("submitted_at", desc=True)
             .limit(10)
             .execute()
         )
-        recent_submissions = [Submission(**s) for s in recent_response.data] if recent_response.data else []
+        recent_submissions = [SubmissionSummary.from_row(r) for r in recent_response.data or ()]
 
         return UserProgress(
             stats=stats,
@@ -161,12 +165,12 @@ async def get_skill_scores(
             .order("score", desc=False)
             .execute()
         )
-        return [SkillScore(**s) for s in response.data] if response.data else []
+        return SKILL_SCORE_LIST_ADAPTER.validate_python(response.data) if response.data else []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get skill scores: {str(e)}")
 
 
-@router.get("/submissions/{user_id}", response_model=list[Submission])
+@router.get("/submissions/{user_id}", response_model=list[Submission], response_model_exclude_none=True)
 async def get_submissions(
     user_id: UUID,
     limit: int = Query(default=50, ge=1, le=200),
@@ -198,7 +202,7 @@ async def get_submissions(
             .execute()
         )
 
-        return [Submission(**s) for s in response.data] if response.data else []
+        return [Submission.from_row(r) for r in response.data or ()]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get submissions: {str(e)}")
 
@@ -229,7 +233,7 @@ async def _get_submission_trends(
             if date not in daily_data:
                 daily_data[date] = {"submissions": 0, "accepted": 0}
             daily_data[date]["submissions"] += 1
-            if sub["status"] == "Accepted":
+            if SubmissionStatus.is_success(sub["status"]):
                 daily_data[date]["accepted"] += 1
 
         trends = []
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 
 from app.db.supabase import get_supabase
-from app.models.schemas import ReviewCompleteRequest, ReviewCompleteResponse, ReviewItem
+from app.models.schemas import REVIEW_ITEM_LIST_ADAPTER, ReviewCompleteRequest, ReviewCompleteResponse, ReviewItem
 
 router = APIRouter()
 
@@ -44,7 +44,7 @@ async def get_due_reviews(
                 .execute()
             )
 
-        return [ReviewItem(**r) for r in response.data] if response.data else []
+        return REVIEW_ITEM_LIST_ADAPTER.validate_python(response.data) if response.data else []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get reviews: {str(e)}")
 
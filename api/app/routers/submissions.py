@@ -9,6 +9,7 @@ from pydantic import BaseModel
 
 from app.auth import AuthenticatedUser, get_optional_user
 from app.db.supabase import get_supabase_client
+from app.routers.coaching import invalidate_coaching_cache
 
 router = APIRouter()
 
@@ -89,6 +90,7 @@ async def create_submission(
         result = supabase.table("submissions").upsert(data).execute()
 
         if result.data:
+            invalidate_coaching_cache(effective_user_id)
             return SubmissionResponse(
                 id=submission.id,
                 success=True,
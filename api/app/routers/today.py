@@ -18,7 +18,7 @@ from app.models.schemas import (
 router = APIRouter()
 
 
-@router.get("/today/{user_id}", response_model=TodaysFocus)
+@router.get("/today/{user_id}", response_model=TodaysFocus, response_model_exclude_none=True)
 async def get_todays_focus(
     user_id: UUID,
     supabase: Annotated[Client, Depends(get_supabase)] = None,
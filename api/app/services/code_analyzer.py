@@ -1,7 +1,7 @@
 """Code analyzer for submission review."""
 
 from app.models.schemas import CodeAnalysisResponse
-from app.services.gemini_gateway import GeminiGateway
+from app.services.gemini_gateway import get_gemini_gateway
 
 
 class CodeAnalyzer:
@@ -13,7 +13,7 @@ class CodeAnalyzer:
     """
 
     def __init__(self):
-        self.gateway = GeminiGateway()
+        self.gateway = get_gemini_gateway()
 
     async def analyze(
         self,
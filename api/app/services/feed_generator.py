@@ -8,7 +8,7 @@ from uuid import UUID
 
 from supabase import Client
 
-from app.services.gemini_gateway import GeminiGateway
+from app.services.gemini_gateway import GeminiGateway, get_gemini_gateway
 from app.services.recommendation_engine import RecommendationEngine
 
 
@@ -21,7 +21,7 @@ class FeedGenerator:
 
     def __init__(self, supabase: Client, gemini: Optional[GeminiGateway] = None):
         self.supabase = supabase
-        self.gemini = gemini or GeminiGateway()
+        self.gemini = gemini or get_gemini_gateway()
         self.recommendation_engine = RecommendationEngine(supabase)
 
     async def get_or_generate_feed(self, user_id: UUID, feed_date: date = None) -> dict:
@@ -4,11 +4,16 @@ import asyncio
 from typing import AsyncGenerator, Optional
 
 import google.generativeai as genai
+import orjson
 
 from app.config import get_settings
 from app.models.schemas import ChatMessage
 
 
+class TipsGenerationError(Exception):
+    """Gemini failed to generate tips; callers should not cache a fallback."""
+
+
 class GeminiGateway:
     """
     Gateway for all Gemini AI interactions.
@@ -244,6 +249,9 @@ Respond with ONLY valid JSON (no markdown fences, no extra text):
 
         Returns:
             List of personalized tips
+
+        Raises:
+            TipsGenerationError: If the Gemini call fails
         """
         if not self.configured:
             return [
@@ -252,7 +260,70 @@ Respond with ONLY valid JSON (no markdown fences, no extra text):
                 "Focus on understanding patterns, not memorizing solutions",
             ]
 
-        # Build rich context sections
+        context_text = self._build_tips_context(context)
+
+        prompt = f"""Based on this LeetCode practice data, provide 3-5 specific, actionable tips:
+
+{context_text}
+
+Requirements:
+1. Be SPECIFIC — reference the exact patterns and mistakes you see (e.g., "You've failed 4 edge-case problems this week. Before your next problem, spend 5 minutes listing edge cases BEFORE coding.")
+2. Be ACTIONABLE — each tip should be something the user can do immediately
+3. Include progress acknowledgment if velocity is improving (e.g., "Your Two Pointer success rate improved — keep reinforcing with medium problems.")
+4. If there are blind spots, address them directly
+5. Be encouraging but honest
+
+Format as a numbered list."""
+
+        try:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            return self._parse_tips_response(response.text)
+        except Exception as e:
+            raise TipsGenerationError(str(e)) from e
+
+    async def generate_tips_batch(self, contexts: dict[str, dict]) -> dict[str, list[str]]:
+        """
+        Generate personalized tips for several users with a single Gemini call.
+
+        Args:
+            contexts: Mapping of user_id to the same context dict generate_tips takes
+
+        Returns:
+            Mapping of user_id to a list of tips; users the model skipped map to []
+
+        Raises:
+            TipsGenerationError: If the Gemini call fails
+        """
+        if not self.configured:
+            fallback = await self.generate_tips({})
+            return {user_id: list(fallback) for user_id in contexts}
+
+        user_sections = "\n\n".join(
+            f"### User {user_id}\n{self._build_tips_context(context)}"
+            for user_id, context in contexts.items()
+        )
+
+        prompt = f"""Based on this LeetCode practice data for several users, provide 3-5 specific, actionable tips for EACH user:
+
+{user_sections}
+
+Requirements:
+1. Be SPECIFIC — reference the exact patterns and mistakes you see for that user
+2. Be ACTIONABLE — each tip should be something the user can do immediately
+3. Include progress acknowledgment if velocity is improving
+4. If there are blind spots, address them directly
+5. Be encouraging but honest
+
+Return ONLY a JSON object mapping each user id to an array of tip strings, e.g. {{"<user id>": ["tip 1", "tip 2"]}}."""
+
+        try:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            return self._parse_tips_batch_response(response.text, contexts.keys())
+        except Exception as e:
+            raise TipsGenerationError(str(e)) from e
+
+    def _build_tips_context(self, context: dict) -> str:
+        """Render a tips context dict into the prompt sections generate_tips uses."""
         sections = []
 
         # Pattern analysis
@@ -311,26 +382,7 @@ Respond with ONLY valid JSON (no markdown fences, no extra text):
                 for w in weak[:5]
             ))
 
-        context_text = "\n\n".join(sections) if sections else "No detailed data available"
-
-        prompt = f"""Based on this LeetCode practice data, provide 3-5 specific, actionable tips:
-
-{context_text}
-
-Requirements:
-1. Be SPECIFIC — reference the exact patterns and mistakes you see (e.g., "You've failed 4 edge-case problems this week. Before your next problem, spend 5 minutes listing edge cases BEFORE coding.")
-2. Be ACTIONABLE — each tip should be something the user can do immediately
-3. Include progress acknowledgment if velocity is improving (e.g., "Your Two Pointer success rate improved — keep reinforcing with medium problems.")
-4. If there are blind spots, address them directly
-5. Be encouraging but honest
-
-Format as a numbered list."""
-
-        try:
-            response = await asyncio.to_thread(self.model.generate_content, prompt)
-            return self._parse_tips_response(response.text)
-        except Exception as e:
-            return [f"Unable to generate tips: {str(e)}"]
+        return "\n\n".join(sections) if sections else "No detailed data available"
 
     def _build_system_prompt(self, context: str) -> str:
         """Build the system prompt for coaching."""
@@ -456,6 +508,28 @@ When reviewing code, explain WHY something is wrong, not just WHAT is wrong.
 
         return tips if tips else [text]  # Fallback to full text if parsing fails
 
+    def _parse_tips_batch_response(self, text: str, user_ids) -> dict[str, list[str]]:
+        """Parse a JSON object of user_id -> tips, tolerating markdown code fences."""
+        cleaned = text.strip()
+        if cleaned.startswith("```"):
+            cleaned = cleaned.split("\n", 1)[-1]
+            if "```" in cleaned:
+                cleaned = cleaned.rsplit("```", 1)[0]
+            cleaned = cleaned.strip()
+
+        try:
+            parsed = orjson.loads(cleaned)
+        except orjson.JSONDecodeError:
+            parsed = {}
+        if not isinstance(parsed, dict):
+            parsed = {}
+
+        result = {}
+        for user_id in user_ids:
+            tips = parsed.get(user_id)
+            result[user_id] = [str(t) for t in tips] if isinstance(tips, list) else []
+        return result
+
     def _fallback_response(self, message: str) -> str:
         """Provide a helpful response when AI is not configured."""
         return """I'm your LeetCode coach, but AI features are currently disabled (API key not configured).
@@ -467,3 +541,15 @@ Here are some general tips:
 4. If stuck, try working through a simple example by hand
 
 To enable AI coaching, configure GOOGLE_API_KEY in the environment."""
+
+
+# Singleton
+_gemini_gateway: Optional[GeminiGateway] = None
+
+
+def get_gemini_gateway() -> GeminiGateway:
+    """Get or create the Gemini gateway singleton."""
+    global _gemini_gateway
+    if _gemini_gateway is None:
+        _gemini_gateway = GeminiGateway()
+    return _gemini_gateway
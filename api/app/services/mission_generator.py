@@ -8,10 +8,13 @@ from uuid import UUID
 
 from supabase import Client
 
-from app.services.gemini_gateway import GeminiGateway
+from app.services.gemini_gateway import GeminiGateway, get_gemini_gateway
 from app.services.pattern_analyzer import PatternAnalyzer
 from app.utils import parse_iso_datetime
 
+# Users generated at once by generate_all_missions, to stay within Gemini rate limits
+_BATCH_CONCURRENCY = 20
+
 
 class MissionGenerator:
     """
@@ -33,7 +36,7 @@ class MissionGenerator:
 
     def __init__(self, supabase: Client, gemini: Optional[GeminiGateway] = None):
         self.supabase = supabase
-        self.gemini = gemini or GeminiGateway()
+        self.gemini = gemini or get_gemini_gateway()
 
     async def generate_mission(
         self,
@@ -913,26 +916,27 @@ Only output the JSON, nothing else."""
         # Deduplicate user IDs
         user_ids = list(set(row["user_id"] for row in users_response.data))
 
-        generated = 0
-        skipped = 0
-        failed = 0
+        semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+        today = date.today()
 
-        for user_id in user_ids:
-            try:
-                existing = await self._get_existing_mission(UUID(user_id), date.today())
-                if existing and existing.get("problems"):
-                    skipped += 1
-                    continue
+        async def generate_one(user_id: str) -> str:
+            async with semaphore:
+                try:
+                    existing = await self._get_existing_mission(UUID(user_id), today)
+                    if existing and existing.get("problems"):
+                        return "skipped"
+
+                    await self.generate_mission(UUID(user_id))
+                    return "generated"
+                except Exception as e:
+                    print(f"Failed to generate mission for {user_id}: {e}")
+                    return "failed"
 
-                await self.generate_mission(UUID(user_id))
-                generated += 1
-            except Exception as e:
-                print(f"Failed to generate mission for {user_id}: {e}")
-                failed += 1
+        outcomes = await asyncio.gather(*(generate_one(user_id) for user_id in user_ids))
 
         return {
-            "generated": generated,
-            "skipped": skipped,
-            "failed": failed,
+            "generated": outcomes.count("generated"),
+            "skipped": outcomes.count("skipped"),
+            "failed": outcomes.count("failed"),
             "total_users": len(user_ids),
         }
@@ -8,7 +8,8 @@ from uuid import UUID
 
 from supabase import Client
 
-from app.services.gemini_gateway import GeminiGateway
+from app.models.schemas import SubmissionStatus
+from app.services.gemini_gateway import GeminiGateway, get_gemini_gateway
 
 
 class PatternAnalyzer:
@@ -23,7 +24,7 @@ class PatternAnalyzer:
 
     def __init__(self, supabase: Client, gemini: Optional[GeminiGateway] = None):
         self.supabase = supabase
-        self.gemini = gemini or GeminiGateway()
+        self.gemini = gemini or get_gemini_gateway()
 
     async def analyze_patterns(self, user_id: UUID, days: int = 14) -> dict:
         """
@@ -125,7 +126,7 @@ class PatternAnalyzer:
             return empty
 
         # Group failures
-        failures = [s for s in submissions if s.get("status") != "Accepted"]
+        failures = [s for s in submissions if not SubmissionStatus.is_success(s.get("status"))]
         failure_counts = {}
         for f in failures:
             status = f.get("status", "Unknown")
@@ -202,7 +203,7 @@ class PatternAnalyzer:
 
         # Split submissions into weeks for velocity
         total = len(submissions)
-        accepted = sum(1 for s in submissions if s.get("status") == "Accepted")
+        accepted = sum(1 for s in submissions if SubmissionStatus.is_success(s.get("status")))
 
         return f"""Analyze this LeetCode user's recent submission history and identify patterns.
 
@@ -259,7 +260,7 @@ Analyze and respond with ONLY valid JSON (no markdown fences):
         ][:3]
 
         total = len(submissions)
-        accepted = sum(1 for s in submissions if s.get("status") == "Accepted")
+        accepted = sum(1 for s in submissions if SubmissionStatus.is_success(s.get("status")))
         rate = accepted / total if total > 0 else 0
 
         if rate >= 0.7:
@@ -3,13 +3,26 @@
 import multiprocessing
 import os
 
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools (from uvicorn[standard]).
+
+    The stock worker's "auto" choices silently fall back to asyncio and h11
+    if either is missing; pinning them makes that a startup error instead.
+    """
+
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "loop": "uvloop", "http": "httptools"}
+
+
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
 
 # Worker processes
 # Cloud Run handles scaling, so we use fewer workers per instance
 workers = int(os.environ.get("GUNICORN_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 4)))
-worker_class = "uvicorn.workers.UvicornWorker"
+worker_class = "gunicorn_conf.UvloopWorker"
 
 # Timeout
 timeout = 300  # 5 minutes for long-running AI requests
@@ -0,0 +1,227 @@
+"""Tests for JWT verification against a stubbed Supabase JWKS endpoint.
+
+The JWKS response is served by respx and tokens are signed with a throwaway
+ES256 key, so verification runs end to end without real API hits.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import jwt
+import pytest
+import respx
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import Depends, FastAPI
+from jwt.algorithms import ECAlgorithm
+from jwt.exceptions import PyJWKClientError
+
+from app import auth
+from app.auth import AuthenticatedUser, JWTAuthMiddleware, get_current_user, get_optional_user
+
+
+JWKS_URL = "http://supabase.test/auth/v1/.well-known/jwks.json"
+KID = "test-key-1"
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+PRIVATE_KEY = ec.generate_private_key(ec.SECP256R1())
+
+
+def make_jwks(kid=KID):
+    jwk = json.loads(ECAlgorithm.to_jwk(PRIVATE_KEY.public_key()))
+    jwk.update(kid=kid, use="sig", alg="ES256")
+    return {"keys": [jwk]}
+
+
+def make_token(kid=KID, **claims):
+    payload = {"sub": USER_ID, "aud": "authenticated", "exp": int(time.time()) + 3600}
+    payload.update(claims)
+    return jwt.encode(payload, PRIVATE_KEY, algorithm="ES256", headers={"kid": kid})
+
+
+@pytest.fixture(autouse=True)
+def stub_jwks():
+    """Point auth at a stubbed JWKS URL with cold key and token caches."""
+    with patch.object(auth, "_jwks_url", JWKS_URL), \
+         patch.object(auth, "_jwks_cache_ttl", 600.0), \
+         patch.object(auth, "_jwks_fetched_at", None), \
+         patch.object(auth, "_signing_keys", {}), \
+         patch.object(auth, "_token_cache", {}), \
+         respx.mock(assert_all_called=False) as router:
+        router.get(JWKS_URL).mock(return_value=httpx.Response(200, json=make_jwks()))
+        yield router
+
+
+class TestSigningKeys:
+    """_get_signing_key fetches the JWKS through the pooled client."""
+
+    def test_fetches_and_caches_key(self, stub_jwks):
+        first = auth._get_signing_key(KID)
+        second = auth._get_signing_key(KID)
+
+        assert first is second
+        assert first.algorithm_name == "ES256"
+        assert stub_jwks.routes[0].call_count == 1
+
+    def test_stale_key_is_refetched(self, stub_jwks):
+        auth._get_signing_key(KID)
+        fetched_at, key = auth._signing_keys[KID]
+        auth._signing_keys[KID] = (fetched_at - 601.0, key)
+
+        auth._get_signing_key(KID)
+
+        assert stub_jwks.routes[0].call_count == 2
+
+    def test_unknown_kid_refetch_is_rate_limited(self, stub_jwks):
+        auth._get_signing_key(KID)
+
+        with pytest.raises(PyJWKClientError):
+            auth._get_signing_key("rotated-away")
+        assert stub_jwks.routes[0].call_count == 1
+
+    def test_warm_signing_keys_populates_cache(self, stub_jwks):
+        assert auth.warm_signing_keys() == 1
+        assert KID in auth._signing_keys
+
+
+class TestTryDecode:
+    """_try_decode verifies tokens against the fetched JWKS."""
+
+    def test_valid_token(self):
+        payload, error = auth._try_decode(make_token(email="a@b.co"))
+
+        assert error is None
+        assert payload["sub"] == USER_ID
+        assert payload["email"] == "a@b.co"
+
+    def test_expired_token(self):
+        payload, error = auth._try_decode(make_token(exp=int(time.time()) - 60))
+
+        assert payload is None
+        assert error.status_code == 401
+        assert error.detail == "Token expired"
+
+    def test_wrong_audience(self):
+        payload, error = auth._try_decode(make_token(aud="anon"))
+
+        assert payload is None
+        assert error.status_code == 401
+
+    def test_jwks_outage_is_500(self, stub_jwks):
+        stub_jwks.routes[0].mock(return_value=httpx.Response(503))
+
+        payload, error = auth._try_decode(make_token())
+
+        assert payload is None
+        assert error.status_code == 500
+
+
+class TestTokenCache:
+    """_authenticate caches verified users until the token's exp claim."""
+
+    def test_cache_hit_skips_verification(self):
+        token = make_token()
+        user, error = auth._authenticate(token)
+
+        with patch.object(auth, "_try_decode") as try_decode:
+            cached, cached_error = auth._authenticate(token)
+
+        assert error is None and cached_error is None
+        assert cached is user
+        try_decode.assert_not_called()
+
+    def test_entry_is_not_served_past_exp(self):
+        token = make_token()
+        auth._authenticate(token)
+        stale_user = AuthenticatedUser(id="someone-else", email=None)
+        auth._token_cache[token] = (time.time() - 1, stale_user)
+
+        assert not auth._is_cached(token)
+        user, error = auth._authenticate(token)
+
+        # Re-verified rather than served from the expired entry
+        assert error is None
+        assert user.id == USER_ID
+
+    def test_cache_is_capped(self):
+        tokens = [make_token(n=n) for n in range(3)]
+
+        with patch.object(auth, "_TOKEN_CACHE_MAX", 2):
+            for token in tokens:
+                auth._authenticate(token)
+
+        assert list(auth._token_cache) == tokens[1:]
+
+    def test_full_cache_drops_expired_entries_first(self):
+        live = make_token(n=0)
+        auth._authenticate(live)
+        auth._token_cache["expired"] = (time.time() - 1, AuthenticatedUser(id="x", email=None))
+
+        with patch.object(auth, "_TOKEN_CACHE_MAX", 2):
+            auth._authenticate(make_token(n=1))
+
+        assert "expired" not in auth._token_cache
+        assert live in auth._token_cache
+
+    def test_invalid_token_is_not_cached(self):
+        token = make_token(aud="anon")
+
+        user, error = auth._authenticate(token)
+
+        assert user is None
+        assert error.status_code == 401
+        assert token not in auth._token_cache
+
+
+class TestAuthMiddleware:
+    """JWTAuthMiddleware stores the user or the auth error for the dependencies."""
+
+    @pytest.fixture
+    def client(self):
+        test_app = FastAPI()
+        test_app.add_middleware(JWTAuthMiddleware)
+
+        @test_app.get("/required")
+        async def required(user: AuthenticatedUser = Depends(get_current_user)):
+            return {"user": user.id}
+
+        @test_app.get("/optional")
+        async def optional(user=Depends(get_optional_user)):
+            return {"user": user.id if user else None}
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=test_app), base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_valid_token(self, client):
+        headers = {"Authorization": f"Bearer {make_token()}"}
+
+        async with client:
+            required = await client.get("/required", headers=headers)
+            optional = await client.get("/optional", headers=headers)
+
+        assert required.json() == {"user": USER_ID}
+        assert optional.json() == {"user": USER_ID}
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_401_for_required_and_anonymous_for_optional(self, client):
+        headers = {"Authorization": f"Bearer {make_token(exp=int(time.time()) - 60)}"}
+
+        async with client:
+            required = await client.get("/required", headers=headers)
+            optional = await client.get("/optional", headers=headers)
+
+        assert required.status_code == 401
+        assert required.json() == {"detail": "Token expired"}
+        assert optional.status_code == 200
+        assert optional.json() == {"user": None}
+
+    @pytest.mark.asyncio
+    async def test_missing_header(self, client):
+        async with client:
+            required = await client.get("/required")
+            optional = await client.get("/optional")
+
+        assert required.status_code == 401
+        assert required.json() == {"detail": "Missing authorization header"}
+        assert optional.json() == {"user": None}
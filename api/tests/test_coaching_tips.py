@@ -0,0 +1,212 @@
+"""Tests for the coaching tips endpoints and the batch tips parser.
+
+Supabase (PostgREST) and Gemini are mocked. No real API hits.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.auth import AuthenticatedUser, get_current_user
+from app.db.supabase import get_postgrest
+from app.main import app
+from app.routers import coaching
+from app.services.gemini_gateway import GeminiGateway, TipsGenerationError, get_gemini_gateway
+
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+OTHER_USER_ID = "00000000-0000-0000-0000-000000000002"
+
+COACHING_CONTEXT = {
+    "failures": [{"problem_slug": "two-sum", "status": "Wrong Answer"}],
+    "weak_skills": [{"tag": "Array", "score": 35.0}],
+    "pattern_analysis": {},
+    "submission_insights": [],
+}
+
+
+def make_postgrest(context=None):
+    """PostgREST client mock whose get_coaching_context RPC returns ``context``."""
+    postgrest = MagicMock()
+
+    async def post(path, json=None):
+        return httpx.Response(
+            200,
+            json=context if context is not None else COACHING_CONTEXT,
+            request=httpx.Request("POST", f"http://postgrest{path}"),
+        )
+
+    postgrest.post = AsyncMock(side_effect=post)
+    return postgrest
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    """Every test starts with empty coaching caches."""
+    with patch.object(coaching, "_tips_cache", {}), \
+         patch.object(coaching, "_weak_skills_cache", {}), \
+         patch.object(coaching, "_context_cache", {}):
+        yield
+
+
+@pytest.fixture
+def gateway():
+    gateway = MagicMock()
+    gateway.generate_tips = AsyncMock(return_value=["Tip one", "Tip two"])
+    gateway.generate_tips_batch = AsyncMock()
+    return gateway
+
+
+@pytest.fixture
+def client_factory(gateway):
+    """Build an ASGI client with PostgREST, Gemini and (optionally) the user overridden."""
+
+    def factory(user_id=USER_ID, postgrest=None):
+        app.dependency_overrides[get_postgrest] = lambda: postgrest or make_postgrest()
+        app.dependency_overrides[get_gemini_gateway] = lambda: gateway
+        if user_id is not None:
+            app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser(id=user_id, email=None)
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    yield factory
+    app.dependency_overrides.clear()
+
+
+class TestParseTipsBatchResponse:
+    """GeminiGateway._parse_tips_batch_response tolerates imperfect LLM output."""
+
+    def setup_method(self):
+        self.gateway = GeminiGateway()
+
+    def test_parses_fenced_json(self):
+        text = '```json\n{"%s": ["Tip A", "Tip B"], "%s": ["Tip C"]}\n```' % (USER_ID, OTHER_USER_ID)
+
+        result = self.gateway._parse_tips_batch_response(text, [USER_ID, OTHER_USER_ID])
+
+        assert result == {USER_ID: ["Tip A", "Tip B"], OTHER_USER_ID: ["Tip C"]}
+
+    def test_malformed_response_maps_every_user_to_empty(self):
+        text = "1. Practice more\n2. Review edge cases"
+
+        result = self.gateway._parse_tips_batch_response(text, [USER_ID, OTHER_USER_ID])
+
+        assert result == {USER_ID: [], OTHER_USER_ID: []}
+
+    def test_non_object_json_maps_every_user_to_empty(self):
+        result = self.gateway._parse_tips_batch_response('["Tip A"]', [USER_ID])
+
+        assert result == {USER_ID: []}
+
+    def test_partially_filled_response(self):
+        # One user missing, one with a non-list value, stray ids ignored
+        text = '{"%s": ["Tip A", 3], "%s": "not a list", "someone-else": ["Tip X"]}' % (
+            USER_ID, OTHER_USER_ID,
+        )
+
+        result = self.gateway._parse_tips_batch_response(text, [USER_ID, OTHER_USER_ID, "missing"])
+
+        assert result == {USER_ID: ["Tip A", "3"], OTHER_USER_ID: [], "missing": []}
+
+
+class TestTipsBatchEndpoint:
+    """POST /coaching/tips/batch."""
+
+    @pytest.mark.asyncio
+    async def test_requires_authentication(self, client_factory):
+        async with client_factory(user_id=None) as client:
+            r = await client.post("/api/coaching/tips/batch", json={"user_ids": [USER_ID]})
+
+        assert r.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_rejects_other_users(self, client_factory, gateway):
+        async with client_factory() as client:
+            r = await client.post(
+                "/api/coaching/tips/batch", json={"user_ids": [USER_ID, OTHER_USER_ID]},
+            )
+
+        assert r.status_code == 403
+        gateway.generate_tips_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generates_and_caches_tips(self, client_factory, gateway):
+        gateway.generate_tips_batch.return_value = {USER_ID: ["Tip A"]}
+
+        async with client_factory() as client:
+            first = await client.post("/api/coaching/tips/batch", json={"user_ids": [USER_ID]})
+            second = await client.post("/api/coaching/tips/batch", json={"user_ids": [USER_ID]})
+
+        assert first.json() == {"tips": {USER_ID: ["Tip A"]}}
+        assert second.json() == first.json()
+        assert gateway.generate_tips_batch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_serves_fallback_without_caching(self, client_factory, gateway):
+        gateway.generate_tips_batch.side_effect = TipsGenerationError("quota exceeded")
+
+        async with client_factory() as client:
+            r = await client.post("/api/coaching/tips/batch", json={"user_ids": [USER_ID]})
+
+        assert r.status_code == 200
+        assert r.json() == {"tips": {USER_ID: ["Unable to generate tips: quota exceeded"]}}
+        assert USER_ID not in coaching._tips_cache
+
+    @pytest.mark.asyncio
+    async def test_user_skipped_by_model_is_not_cached(self, client_factory, gateway):
+        gateway.generate_tips_batch.return_value = {USER_ID: []}
+
+        async with client_factory() as client:
+            r = await client.post("/api/coaching/tips/batch", json={"user_ids": [USER_ID]})
+
+        assert r.json() == {"tips": {USER_ID: []}}
+        assert USER_ID not in coaching._tips_cache
+
+
+class TestCachedTips:
+    """_cached_tips only caches successful generations."""
+
+    @pytest.mark.asyncio
+    async def test_generation_error_is_served_but_not_cached(self, gateway):
+        gateway.generate_tips.side_effect = TipsGenerationError("timeout")
+
+        tips = await coaching._cached_tips(gateway, USER_ID, {"weak_skills": []})
+
+        assert tips == ["Unable to generate tips: timeout"]
+        assert USER_ID not in coaching._tips_cache
+
+
+class TestTipsConditionalGet:
+    """GET /coaching/tips/{user_id} validators."""
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_gets_304(self, client_factory, gateway):
+        async with client_factory() as client:
+            first = await client.get(f"/api/coaching/tips/{USER_ID}")
+            etag = first.headers["etag"]
+            second = await client.get(
+                f"/api/coaching/tips/{USER_ID}", headers={"If-None-Match": etag},
+            )
+
+        assert first.status_code == 200
+        assert first.json() == {"tips": ["Tip one", "Tip two"]}
+        assert "max-age=60" in first.headers["cache-control"]
+        assert "vary" not in first.headers
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_after_invalidation(self, client_factory, gateway):
+        gateway.generate_tips.side_effect = [["Tip one"], ["A fresh tip"]]
+
+        async with client_factory() as client:
+            first = await client.get(f"/api/coaching/tips/{USER_ID}")
+            coaching.invalidate_coaching_cache(USER_ID)
+            second = await client.get(
+                f"/api/coaching/tips/{USER_ID}", headers={"If-None-Match": first.headers["etag"]},
+            )
+
+        assert second.status_code == 200
+        assert second.json() == {"tips": ["A fresh tip"]}
+        assert second.headers["etag"] != first.headers["etag"]
@@ -202,6 +202,13 @@ def exercise_id():
     return uuid4()
 
 
+@pytest.fixture(autouse=True)
+def cold_track_cache():
+    """Track rows are cached per process; start every test with a cold cache."""
+    with patch("app.routers.language._track_cache", {}):
+        yield
+
+
 @pytest.fixture
 def mock_sb():
     """Base mock Supabase client."""
@@ -736,16 +743,6 @@ class TestSubmitDailyExercise:
         exercise_row = make_exercise_row(exercise_id=exercise_id, status="pending")
         exercise_row["language_tracks"] = SAMPLE_TRACK_DATA
 
-        progress_chain = make_chain([{
-            "id": str(uuid4()),
-            "user_id": str(TEST_USER_ID),
-            "track_id": TEST_TRACK_ID,
-            "completed_topics": [],
-            "sessions_completed": 0,
-            "average_score": 0.0,
-        }])
-
-        progress_update_chain = make_chain([])
         table_call_counts = {}
 
         def table_handler(table_name):
@@ -754,13 +751,10 @@ class TestSubmitDailyExercise:
 
             if table_name == "language_daily_exercises" and idx == 0:
                 return make_chain(exercise_row)
-            if table_name == "language_track_progress" and idx == 0:
-                return progress_chain
-            if table_name == "language_track_progress" and idx == 1:
-                return progress_update_chain
             return make_chain([])
 
         mock_sb.table.side_effect = table_handler
+        mock_sb.rpc.return_value = make_chain(None)
 
         with patch("app.routers.language.get_language_service", return_value=mock_language_service), \
              patch("app.routers.language._daily_exercises_cache", {}):
@@ -774,8 +768,15 @@ class TestSubmitDailyExercise:
             app.dependency_overrides.clear()
 
         assert response.status_code == 200
-        # Verify track progress was updated
-        progress_update_chain.update.assert_called_once()
+        # Verify track progress was updated through the atomic upsert RPC
+        progress_calls = [
+            c for c in mock_sb.rpc.call_args_list
+            if c.args[0] == "upsert_language_track_progress"
+        ]
+        assert len(progress_calls) == 1
+        params = progress_calls[0].args[1]
+        assert params["p_track_id"] == TEST_TRACK_ID
+        assert params["p_topic"] == exercise_row["topic"]
 
     @pytest.mark.asyncio
     async def test_submit_exercise_returns_grade(self, mock_sb, mock_language_service, exercise_id):
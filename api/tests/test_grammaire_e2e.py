@@ -307,6 +307,13 @@ def exercise_id():
     return uuid4()
 
 
+@pytest.fixture(autouse=True)
+def cold_track_cache():
+    """Track rows are cached per process; start every test with a cold cache."""
+    with patch("app.routers.language._track_cache", {}):
+        yield
+
+
 @pytest.fixture
 def mock_sb():
     return MagicMock()
@@ -744,15 +751,6 @@ class TestExerciseSubmission:
         exercise_row = make_exercise_row(exercise_id=exercise_id, topic="L'ARTICLE", status="pending")
         exercise_row["language_tracks"] = GRAMMAIRE_TRACK_DATA
 
-        progress_chain = make_chain([{
-            "id": str(uuid4()),
-            "user_id": str(TEST_USER_ID),
-            "track_id": GRAMMAIRE_TRACK_ID,
-            "completed_topics": [],
-            "sessions_completed": 0,
-            "average_score": 0.0,
-        }])
-        progress_update_chain = make_chain([])
         table_call_counts = {}
 
         def table_handler(table_name):
@@ -760,13 +758,10 @@ class TestExerciseSubmission:
             table_call_counts[table_name] = idx + 1
             if table_name == "language_daily_exercises" and idx == 0:
                 return make_chain(exercise_row)
-            if table_name == "language_track_progress" and idx == 0:
-                return progress_chain
-            if table_name == "language_track_progress" and idx == 1:
-                return progress_update_chain
             return make_chain([])
 
         mock_sb.table.side_effect = table_handler
+        mock_sb.rpc.return_value = make_chain(None)
 
         with patch("app.routers.language.get_language_service", return_value=mock_language_service), \
              patch("app.routers.language._daily_exercises_cache", {}):
@@ -780,10 +775,15 @@ class TestExerciseSubmission:
             app.dependency_overrides.clear()
 
         assert response.status_code == 200
-        # Verify track progress was updated
-        progress_update_chain.update.assert_called_once()
-        update_data = progress_update_chain.update.call_args[0][0]
-        assert "L'ARTICLE" in update_data["completed_topics"]
+        # Verify track progress was upserted with a passing score for the topic
+        progress_calls = [
+            c for c in mock_sb.rpc.call_args_list
+            if c.args[0] == "upsert_language_track_progress"
+        ]
+        assert len(progress_calls) == 1
+        params = progress_calls[0].args[1]
+        assert params["p_topic"] == "L'ARTICLE"
+        assert params["p_score"] >= 7
 
     @pytest.mark.asyncio
     async def test_failing_score_adds_to_review_queue(self, mock_sb, mock_language_service_fail, exercise_id):
@@ -910,20 +910,9 @@ class TestProgressTracking:
 
             if table_name == "user_language_settings":
                 return make_chain([{"active_track_id": GRAMMAIRE_TRACK_ID, "user_id": str(TEST_USER_ID)}])
-            if table_name == "language_tracks":
-                return make_chain(GRAMMAIRE_TRACK_DATA)
-            if table_name == "language_track_progress":
-                return make_chain([{
-                    "completed_topics": ["L'ARTICLE", "L'ADJECTIF"],
-                }])
-            if table_name == "language_attempts":
-                if idx == 0:
-                    return make_chain([], count=6)  # exercises_this_week
-                return make_chain([{"score": 8.5}])  # recent score
             return make_chain([])
 
-        mock_sb.table.side_effect = table_handler
-        mock_sb.rpc.return_value = make_chain([{
+        review_rows = [{
             "id": str(uuid4()),
             "user_id": str(TEST_USER_ID),
             "track_id": GRAMMAIRE_TRACK_ID,
@@ -936,7 +925,27 @@ class TestProgressTracking:
             "last_reviewed": None,
             "source_attempt_id": None,
             "created_at": datetime.utcnow().isoformat(),
-        }])
+        }]
+        # get_next_topic resolves the first uncompleted chapter server-side
+        next_topic_row = {
+            **{
+                k: GRAMMAIRE_TRACK_DATA[k]
+                for k in ("id", "name", "description", "language", "level", "total_topics")
+            },
+            "topic_count": len(GRAMMAIRE_TRACK_DATA["topics"]),
+            "completed_count": 2,
+            "next_topic": GRAMMAIRE_TRACK_DATA["topics"][2],
+        }
+
+        def rpc_handler(name, params):
+            if name == "get_next_topic":
+                return make_chain(next_topic_row)
+            if name == "get_language_user_stats":
+                return make_chain({"exercises_this_week": 6, "recent_score": 8.5})
+            return make_chain(review_rows)
+
+        mock_sb.table.side_effect = table_handler
+        mock_sb.rpc.side_effect = rpc_handler
 
         with patch("app.routers.language._lang_dashboard_cache", {}):
             app.dependency_overrides[get_supabase] = lambda: mock_sb
@@ -1277,7 +1286,7 @@ class TestFullUserJourney:
             idx = table_call_counts.get(table_name, 0)
             table_call_counts[table_name] = idx + 1
             if table_name == "language_tracks":
-                return make_chain({"id": GRAMMAIRE_TRACK_ID, "name": "Grammaire Progressive B2"})
+                return make_chain(GRAMMAIRE_TRACK_DATA)
             return make_chain([])
 
         mock_sb.table.side_effect = set_track_handler
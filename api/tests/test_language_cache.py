@@ -0,0 +1,198 @@
+"""Tests for the language router's in-process caches.
+
+Covers the track row cache (_load_track) and the dashboard summary cache with
+its single-flight rebuilds. Supabase is mocked; no real API hits.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import language
+
+
+TEST_USER_ID = UUID("00000000-0000-0000-0000-000000000099")
+TRACK_ID = "5eba8cda-1cbf-4d07-b770-1204a7b54a75"
+
+FULL_TRACK_ROW = {
+    "id": TRACK_ID,
+    "name": "Grammaire Progressive B2",
+    "description": "Grammaire avancée du français",
+    "language": "french",
+    "level": "b2",
+    "topics": [{"name": "L'ARTICLE", "order": 1}],
+    "total_topics": 1,
+    "rubric": {"accuracy": 3, "grammar": 3, "vocabulary": 2, "naturalness": 2},
+    "source_book": None,
+    "created_at": "2026-01-01T00:00:00",
+}
+
+
+def make_track_client(row):
+    """Supabase mock whose language_tracks query returns ``row``."""
+    query = MagicMock()
+    query.select.return_value = query
+    query.eq.return_value = query
+    query.single.return_value = query
+    query.execute.return_value = MagicMock(data=row)
+
+    sb = MagicMock()
+    sb.table.return_value = query
+    return sb, query
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    """Every test starts with empty caches and no rebuilds in flight."""
+    with patch.object(language, "_track_cache", {}), \
+         patch.object(language, "_lang_dashboard_cache", {}), \
+         patch.object(language, "_lang_dashboard_inflight", {}):
+        yield
+
+
+class TestTrackCache:
+    """_load_track serves complete rows from a bounded TTL cache."""
+
+    @pytest.mark.asyncio
+    async def test_full_row_is_cached(self):
+        sb, query = make_track_client(FULL_TRACK_ROW)
+
+        first = await language._load_track(sb, TRACK_ID)
+        second = await language._load_track(sb, TRACK_ID)
+
+        assert first == second == FULL_TRACK_ROW
+        assert query.execute.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_row_is_not_cached(self):
+        sb, query = make_track_client({"id": TRACK_ID, "name": "Grammaire Progressive B2"})
+
+        await language._load_track(sb, TRACK_ID)
+        await language._load_track(sb, TRACK_ID)
+
+        assert TRACK_ID not in language._track_cache
+        assert query.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_track_is_not_cached(self):
+        sb, query = make_track_client(None)
+
+        assert await language._load_track(sb, TRACK_ID) is None
+        assert TRACK_ID not in language._track_cache
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refetched(self):
+        sb, query = make_track_client(FULL_TRACK_ROW)
+
+        await language._load_track(sb, TRACK_ID)
+        language._track_cache[TRACK_ID] = (time.monotonic() - 1, FULL_TRACK_ROW)
+        await language._load_track(sb, TRACK_ID)
+
+        assert query.execute.call_count == 2
+
+    def test_store_caps_cache_size(self):
+        with patch.object(language, "_TRACK_CACHE_MAX", 2):
+            for track_id in ("a", "b", "c"):
+                language._store_track(track_id, FULL_TRACK_ROW)
+
+        assert list(language._track_cache) == ["b", "c"]
+
+
+class TestDashboardCache:
+    """get_dashboard_summary caches rebuilds and shares concurrent ones."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_rebuild(self):
+        summary = object()
+        release = asyncio.Event()
+        calls = []
+
+        async def fake_build(supabase, user_id):
+            calls.append(user_id)
+            await release.wait()
+            return summary
+
+        with patch.object(language, "_build_dashboard_summary", fake_build):
+            waiters = [
+                asyncio.ensure_future(language.get_dashboard_summary(TEST_USER_ID, MagicMock()))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*waiters)
+
+            # Served from the cache now, without another rebuild
+            cached = await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+
+        assert calls == [str(TEST_USER_ID)]
+        assert results == [summary, summary, summary]
+        assert cached is summary
+        assert not language._lang_dashboard_inflight
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_rebuilt(self):
+        calls = []
+
+        async def fake_build(supabase, user_id):
+            calls.append(user_id)
+            return object()
+
+        with patch.object(language, "_build_dashboard_summary", fake_build):
+            await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+            expiry, summary = language._lang_dashboard_cache[str(TEST_USER_ID)]
+            language._lang_dashboard_cache[str(TEST_USER_ID)] = (time.monotonic() - 1, summary)
+            await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_cached_summary(self):
+        calls = []
+
+        async def fake_build(supabase, user_id):
+            calls.append(user_id)
+            return object()
+
+        with patch.object(language, "_build_dashboard_summary", fake_build):
+            await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+            language._invalidate_lang_dashboard(TEST_USER_ID)
+            assert str(TEST_USER_ID) not in language._lang_dashboard_cache
+            await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_racing_invalidation_is_not_cached(self):
+        release = asyncio.Event()
+
+        async def fake_build(supabase, user_id):
+            await release.wait()
+            return "stale"
+
+        with patch.object(language, "_build_dashboard_summary", fake_build):
+            waiter = asyncio.ensure_future(language.get_dashboard_summary(TEST_USER_ID, MagicMock()))
+            await asyncio.sleep(0)
+            # A write lands while the rebuild is still reading
+            language._invalidate_lang_dashboard(TEST_USER_ID)
+            release.set()
+            assert await waiter == "stale"
+
+        assert str(TEST_USER_ID) not in language._lang_dashboard_cache
+        assert not language._lang_dashboard_inflight
+
+    @pytest.mark.asyncio
+    async def test_failed_rebuild_is_not_cached(self):
+        async def failing_build(supabase, user_id):
+            raise RuntimeError("db down")
+
+        with patch.object(language, "_build_dashboard_summary", failing_build):
+            with pytest.raises(HTTPException) as exc_info:
+                await language.get_dashboard_summary(TEST_USER_ID, MagicMock())
+
+        assert exc_info.value.status_code == 500
+        assert not language._lang_dashboard_cache
+        assert not language._lang_dashboard_inflight
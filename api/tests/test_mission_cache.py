@@ -0,0 +1,146 @@
+"""Tests for the daily mission cache and its single-flight generation.
+
+Mission generation is replaced with a fake; no Supabase or Gemini hits.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import mission
+
+
+TEST_USER_ID = UUID("00000000-0000-0000-0000-000000000099")
+CACHE_KEY = str(TEST_USER_ID)
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    """Every test starts with an empty mission cache and nothing in flight."""
+    with patch.object(mission, "_mission_cache", {}), \
+         patch.object(mission, "_mission_inflight", {}):
+        yield
+
+
+class TestMissionSingleFlight:
+    """get_daily_mission caches generations and shares concurrent ones."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_generation(self):
+        response = object()
+        release = asyncio.Event()
+        calls = []
+
+        async def fake_generate(supabase, user_id):
+            calls.append(user_id)
+            await release.wait()
+            return response
+
+        with patch.object(mission, "_generate_mission", fake_generate):
+            waiters = [
+                asyncio.ensure_future(mission.get_daily_mission(TEST_USER_ID, MagicMock()))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*waiters)
+
+            # Served from the cache now, without another generation
+            cached = await mission.get_daily_mission(TEST_USER_ID, MagicMock())
+
+        assert calls == [TEST_USER_ID]
+        assert results == [response, response, response]
+        assert cached is response
+        assert not mission._mission_inflight
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_generation(self):
+        release = asyncio.Event()
+
+        async def fake_generate(supabase, user_id):
+            await release.wait()
+            return "mission"
+
+        with patch.object(mission, "_generate_mission", fake_generate):
+            first = asyncio.ensure_future(mission.get_daily_mission(TEST_USER_ID, MagicMock()))
+            second = asyncio.ensure_future(mission.get_daily_mission(TEST_USER_ID, MagicMock()))
+            await asyncio.sleep(0)
+            first.cancel()
+            release.set()
+
+            assert await second == "mission"
+
+        assert mission._mission_cache[CACHE_KEY][1] == "mission"
+
+    @pytest.mark.asyncio
+    async def test_failed_generation_is_not_cached(self):
+        calls = []
+
+        async def failing_generate(supabase, user_id):
+            calls.append(user_id)
+            raise RuntimeError("gemini down")
+
+        with patch.object(mission, "_generate_mission", failing_generate):
+            for _ in range(2):
+                with pytest.raises(HTTPException) as exc_info:
+                    await mission.get_daily_mission(TEST_USER_ID, MagicMock())
+                assert exc_info.value.status_code == 500
+
+        # The second call retried instead of reusing the failure
+        assert len(calls) == 2
+        assert not mission._mission_cache
+        assert not mission._mission_inflight
+
+    @pytest.mark.asyncio
+    async def test_generation_racing_invalidation_is_not_cached(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def fake_generate(supabase, user_id):
+            calls.append(user_id)
+            if len(calls) == 1:
+                await release.wait()
+                return "stale"
+            return "fresh"
+
+        with patch.object(mission, "_generate_mission", fake_generate):
+            waiter = asyncio.ensure_future(mission.get_daily_mission(TEST_USER_ID, MagicMock()))
+            await asyncio.sleep(0)
+            # A regenerate or reset lands while the first generation is running
+            mission._invalidate_mission(CACHE_KEY)
+
+            # New callers don't join the invalidated generation
+            assert await mission.get_daily_mission(TEST_USER_ID, MagicMock()) == "fresh"
+
+            release.set()
+            assert await waiter == "stale"
+
+        assert mission._mission_cache[CACHE_KEY][1] == "fresh"
+        assert not mission._mission_inflight
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_regenerated(self):
+        calls = []
+
+        async def fake_generate(supabase, user_id):
+            calls.append(user_id)
+            return object()
+
+        with patch.object(mission, "_generate_mission", fake_generate):
+            await mission.get_daily_mission(TEST_USER_ID, MagicMock())
+            expiry, response = mission._mission_cache[CACHE_KEY]
+            mission._mission_cache[CACHE_KEY] = (time.monotonic() - 1, response)
+            await mission.get_daily_mission(TEST_USER_ID, MagicMock())
+
+        assert len(calls) == 2
+
+    def test_store_caps_cache_size(self):
+        with patch.object(mission, "_MISSION_CACHE_MAX", 2):
+            for user_id in ("a", "b", "c"):
+                mission._store_mission(user_id, object())
+
+        assert list(mission._mission_cache) == ["b", "c"]
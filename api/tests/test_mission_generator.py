@@ -201,7 +201,7 @@ class TestMissionApiEndpoint:
     @pytest.mark.asyncio
     async def test_get_mission_returns_problems(self, client, test_user_id):
         """Test GET /api/mission/{user_id} returns problems."""
-        with patch("app.routers.mission.GeminiGateway") as MockGemini:
+        with patch("app.routers.mission.get_gemini_gateway") as MockGemini:
             # Configure mock Gemini
             mock_instance = MagicMock()
             mock_instance.configured = True
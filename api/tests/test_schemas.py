@@ -0,0 +1,62 @@
+"""Tests for schema fast paths that skip pydantic validation."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.schemas import SubmissionSummary
+
+
+SUBMISSION_ROW = {
+    "id": "7d9f2c1e-3b4a-4c5d-8e6f-0a1b2c3d4e5f",
+    "user_id": "00000000-0000-0000-0000-000000000001",
+    "problem_slug": "two-sum",
+    "problem_title": "Two Sum",
+    "problem_id": 1,
+    "difficulty": "Easy",
+    "tags": ["Array", "Hash Table"],
+    "status": "Wrong Answer",
+    "runtime_ms": 52,
+    "runtime_percentile": 81.5,
+    "memory_mb": 17.2,
+    "memory_percentile": 40.0,
+    "attempt_number": 2,
+    "time_elapsed_seconds": 600,
+    "language": "python3",
+    "session_id": "11111111-2222-3333-4444-555555555555",
+    "submitted_at": "2026-01-01T12:00:00+00:00",
+    "created_at": "2026-01-01T12:00:01+00:00",
+    # Not part of the summary; dropped by both paths
+    "code": "class Solution: ...",
+}
+
+
+class TestSubmissionSummaryFromRow:
+    """from_row must produce exactly what model_validate would."""
+
+    def test_matches_model_validate(self):
+        fast = SubmissionSummary.from_row(SUBMISSION_ROW)
+        validated = SubmissionSummary.model_validate(SUBMISSION_ROW)
+
+        assert fast.model_dump() == validated.model_dump()
+        assert fast.model_dump_json() == validated.model_dump_json()
+
+    def test_matches_model_validate_with_nulls(self):
+        row = {**SUBMISSION_ROW, "difficulty": None, "session_id": None, "tags": None}
+
+        fast = SubmissionSummary.from_row(row)
+        validated = SubmissionSummary.model_validate(row)
+
+        assert fast.model_dump() == validated.model_dump()
+
+    def test_unknown_status_raises_validation_error(self):
+        with pytest.raises(ValidationError):
+            SubmissionSummary.from_row({**SUBMISSION_ROW, "status": "Output Limit Exceeded"})
+
+    def test_unknown_difficulty_raises_validation_error(self):
+        with pytest.raises(ValidationError):
+            SubmissionSummary.from_row({**SUBMISSION_ROW, "difficulty": "Extreme"})
+
+    def test_missing_column_raises_validation_error(self):
+        row = {k: v for k, v in SUBMISSION_ROW.items() if k != "user_id"}
+        with pytest.raises(ValidationError):
+            SubmissionSummary.from_row(row)
@@ -0,0 +1,50 @@
+-- Coaching context in one round trip: recent failures, weakest skills,
+-- cached pattern analysis and recent submission insights for a user
+CREATE OR REPLACE FUNCTION get_coaching_context(p_user_id UUID)
+RETURNS json
+LANGUAGE sql STABLE
+AS $$
+  SELECT json_build_object(
+    'failures', COALESCE((
+      SELECT json_agg(f)
+      FROM (
+        SELECT problem_slug, status, tags, status_msg, total_correct, total_testcases
+        FROM submissions
+        WHERE user_id = p_user_id
+          AND status <> 'Accepted'
+        ORDER BY submitted_at DESC
+        LIMIT 5
+      ) f
+    ), '[]'::json),
+    'weak_skills', COALESCE((
+      SELECT json_agg(w)
+      FROM (
+        SELECT tag, score
+        FROM skill_scores
+        WHERE user_id = p_user_id
+        ORDER BY score
+        LIMIT 5
+      ) w
+    ), '[]'::json),
+    'pattern_analysis', COALESCE((
+      SELECT patterns
+      FROM user_pattern_analysis
+      WHERE user_id = p_user_id
+      LIMIT 1
+    ), '{}'::jsonb),
+    'submission_insights', COALESCE((
+      SELECT json_agg(i)
+      FROM (
+        SELECT pattern_type, concept_gap
+        FROM submission_insights
+        WHERE user_id = p_user_id
+        ORDER BY created_at DESC
+        LIMIT 15
+      ) i
+    ), '[]'::json)
+  );
+$$;
+
+GRANT EXECUTE ON FUNCTION get_coaching_context TO anon;
+GRANT EXECUTE ON FUNCTION get_coaching_context TO authenticated;
+GRANT EXECUTE ON FUNCTION get_coaching_context TO service_role;
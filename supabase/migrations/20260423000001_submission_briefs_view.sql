@@ -0,0 +1,16 @@
+-- Lightweight submission projection for chat context: code truncated in SQL
+-- so PostgREST never ships full source for a 1000-character preview
+CREATE OR REPLACE VIEW submission_briefs
+WITH (security_invoker = true) AS
+SELECT
+  id,
+  user_id,
+  status,
+  problem_slug,
+  language,
+  LEFT(code, 1000) AS code
+FROM submissions;
+
+GRANT SELECT ON submission_briefs TO anon;
+GRANT SELECT ON submission_briefs TO authenticated;
+GRANT SELECT ON submission_briefs TO service_role;
@@ -0,0 +1,34 @@
+-- Distinct missed concepts from a user's most recent graded language attempts,
+-- most recent first, so callers don't pull whole attempt rows to build the list
+CREATE OR REPLACE FUNCTION get_recent_weak_areas(
+  p_user_id UUID,
+  p_attempts INTEGER DEFAULT 5,
+  p_limit INTEGER DEFAULT 5
+)
+RETURNS TEXT[]
+LANGUAGE sql STABLE
+AS $$
+  SELECT COALESCE(array_agg(concept ORDER BY rn, ord), '{}')
+  FROM (
+    SELECT concept, rn, ord
+    FROM (
+      SELECT DISTINCT ON (c.concept) c.concept, a.rn, c.ord
+      FROM (
+        SELECT missed_concepts, ROW_NUMBER() OVER (ORDER BY graded_at DESC) AS rn
+        FROM language_attempts
+        WHERE user_id = p_user_id
+          AND status = 'graded'
+        ORDER BY graded_at DESC
+        LIMIT p_attempts
+      ) a
+      CROSS JOIN LATERAL unnest(a.missed_concepts) WITH ORDINALITY AS c(concept, ord)
+      ORDER BY c.concept, a.rn, c.ord
+    ) firsts
+    ORDER BY rn, ord
+    LIMIT p_limit
+  ) t;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_recent_weak_areas TO anon;
+GRANT EXECUTE ON FUNCTION get_recent_weak_areas TO authenticated;
+GRANT EXECUTE ON FUNCTION get_recent_weak_areas TO service_role;
@@ -0,0 +1,33 @@
+-- A user's position on a language track: the track summary, topic and
+-- completion counts, and the lowest-order topic not yet completed.
+-- Saves shipping the whole topics array to find one entry.
+CREATE OR REPLACE FUNCTION get_next_topic(p_user_id UUID, p_track_id UUID)
+RETURNS json
+LANGUAGE sql STABLE
+AS $$
+  SELECT json_build_object(
+    'id', t.id,
+    'name', t.name,
+    'description', t.description,
+    'language', t.language,
+    'level', t.level,
+    'total_topics', t.total_topics,
+    'topic_count', jsonb_array_length(t.topics),
+    'completed_count', COALESCE(cardinality(p.completed_topics), 0),
+    'next_topic', (
+      SELECT topic
+      FROM jsonb_array_elements(t.topics) WITH ORDINALITY AS e(topic, pos)
+      WHERE NOT COALESCE(topic->>'name' = ANY(p.completed_topics), false)
+      ORDER BY COALESCE((topic->>'order')::int, 0), pos
+      LIMIT 1
+    )
+  )
+  FROM language_tracks t
+  LEFT JOIN language_track_progress p
+    ON p.track_id = t.id AND p.user_id = p_user_id
+  WHERE t.id = p_track_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_next_topic TO anon;
+GRANT EXECUTE ON FUNCTION get_next_topic TO authenticated;
+GRANT EXECUTE ON FUNCTION get_next_topic TO service_role;
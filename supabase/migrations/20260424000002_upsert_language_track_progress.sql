@@ -0,0 +1,39 @@
+-- Record one graded language session against a user's track progress in a
+-- single statement, so concurrent submissions can't overwrite each other's
+-- completed topics or session counts. A topic only counts as completed at
+-- score >= 7 (the proficiency threshold).
+CREATE OR REPLACE FUNCTION upsert_language_track_progress(
+  p_user_id UUID,
+  p_track_id UUID,
+  p_topic TEXT,
+  p_score REAL
+)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO language_track_progress AS p (
+    user_id, track_id, completed_topics, sessions_completed, average_score, last_activity_at
+  )
+  VALUES (
+    p_user_id,
+    p_track_id,
+    CASE WHEN p_score >= 7 THEN ARRAY[p_topic] ELSE '{}'::TEXT[] END,
+    1,
+    p_score,
+    NOW()
+  )
+  ON CONFLICT (user_id, track_id) DO UPDATE SET
+    completed_topics = CASE
+      WHEN p_score >= 7 AND NOT (p_topic = ANY(COALESCE(p.completed_topics, '{}')))
+        THEN array_append(COALESCE(p.completed_topics, '{}'), p_topic)
+      ELSE p.completed_topics
+    END,
+    sessions_completed = COALESCE(p.sessions_completed, 0) + 1,
+    average_score = (COALESCE(p.average_score, 0) * COALESCE(p.sessions_completed, 0) + p_score)
+      / (COALESCE(p.sessions_completed, 0) + 1),
+    last_activity_at = NOW();
+$$;
+
+GRANT EXECUTE ON FUNCTION upsert_language_track_progress TO anon;
+GRANT EXECUTE ON FUNCTION upsert_language_track_progress TO authenticated;
+GRANT EXECUTE ON FUNCTION upsert_language_track_progress TO service_role;
@@ -0,0 +1,15 @@
+-- Composite indexes for the per-user language_attempts reads
+
+-- Recent graded attempts (weak areas, latest score):
+--   WHERE user_id = ? AND status = 'graded' ORDER BY graded_at DESC LIMIT n
+CREATE INDEX IF NOT EXISTS idx_language_attempts_user_graded_at
+  ON language_attempts(user_id, graded_at DESC)
+  WHERE status = 'graded';
+
+-- Attempt history (ORDER BY created_at DESC) and the weekly exercise count
+-- (created_at >= ?); a btree serves both scan directions
+CREATE INDEX IF NOT EXISTS idx_language_attempts_user_created_at
+  ON language_attempts(user_id, created_at DESC);
+
+-- Every user_id lookup is now covered by the composite index's leading column
+DROP INDEX IF EXISTS idx_language_attempts_user_id;
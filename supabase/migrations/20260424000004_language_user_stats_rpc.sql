@@ -0,0 +1,27 @@
+-- Dashboard stats from language_attempts in one round trip: exercises
+-- started in the last 7 days and the most recent graded score
+CREATE OR REPLACE FUNCTION get_language_user_stats(p_user_id UUID)
+RETURNS json
+LANGUAGE sql STABLE
+AS $$
+  SELECT json_build_object(
+    'exercises_this_week', (
+      SELECT COUNT(*)
+      FROM language_attempts
+      WHERE user_id = p_user_id
+        AND created_at >= NOW() - INTERVAL '7 days'
+    ),
+    'recent_score', (
+      SELECT score
+      FROM language_attempts
+      WHERE user_id = p_user_id
+        AND status = 'graded'
+      ORDER BY graded_at DESC
+      LIMIT 1
+    )
+  );
+$$;
+
+GRANT EXECUTE ON FUNCTION get_language_user_stats TO anon;
+GRANT EXECUTE ON FUNCTION get_language_user_stats TO authenticated;
+GRANT EXECUTE ON FUNCTION get_language_user_stats TO service_role;
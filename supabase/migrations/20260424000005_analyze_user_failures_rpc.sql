@@ -0,0 +1,27 @@
+-- Most common failure status and difficulty across a user's recent failed
+-- submissions on any of the given tags, so callers don't pull the rows to count
+CREATE OR REPLACE FUNCTION analyze_user_failures(
+  p_user_id UUID,
+  p_tags TEXT[],
+  p_limit INTEGER DEFAULT 15
+)
+RETURNS TABLE (most_common_error TEXT, most_failed_diff TEXT)
+LANGUAGE sql STABLE
+AS $$
+  SELECT
+    mode() WITHIN GROUP (ORDER BY status),
+    mode() WITHIN GROUP (ORDER BY COALESCE(difficulty, 'Unknown'))
+  FROM (
+    SELECT status, difficulty
+    FROM submissions
+    WHERE user_id = p_user_id
+      AND status <> 'Accepted'
+      AND tags && p_tags
+    ORDER BY submitted_at DESC
+    LIMIT p_limit
+  ) f;
+$$;
+
+GRANT EXECUTE ON FUNCTION analyze_user_failures TO anon;
+GRANT EXECUTE ON FUNCTION analyze_user_failures TO authenticated;
+GRANT EXECUTE ON FUNCTION analyze_user_failures TO service_role;
@@ -0,0 +1,15 @@
+-- Indexes for the per-user submissions reads filtered by tag
+
+-- Recent submissions (WHERE user_id = ? ORDER BY submitted_at DESC LIMIT n),
+-- including the tag-filtered domain and failure-analysis queries
+CREATE INDEX IF NOT EXISTS idx_submissions_user_submitted_at
+  ON submissions(user_id, submitted_at DESC);
+
+-- Array containment / overlap on tags (PostgREST cs / ov -> @> / &&)
+CREATE INDEX IF NOT EXISTS idx_submissions_tags
+  ON submissions USING GIN (tags);
+
+-- Every user_id lookup is now covered by the composite index's leading column.
+-- skill_scores needs nothing new: its (user_id, tag) primary key serves the
+-- in_("tag", ...) lookups.
+DROP INDEX IF EXISTS idx_submissions_user_id;